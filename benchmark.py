@@ -0,0 +1,240 @@
+import argparse
+import csv
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import omdb_stand_in
+
+TOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icm-challenge-tool.py')
+HEADER = ['user', 'imdb', 'flags', 'checks', 'Title', 'Year', 'Runtime', 'Genre', 'Director', 'Country', 'Language']
+FLAGS = ['', 'm', 's', 'sc', 'c']
+# modules a report run should not need to import
+HEAVY_MODULES = ['requests', 'yaml', 'tkinter', 'sqlite3', 'multiprocessing', 'subprocess']
+IMPORT_SCRIPT = '''import importlib.util, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('icm_challenge_tool', sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(time.perf_counter() - start)
+print(' '.join(module for module in sys.argv[2:] if module in sys.modules))
+'''
+
+
+def load_tool(path=TOOL_PATH):
+    spec = importlib.util.spec_from_file_location('icm_challenge_tool', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_films(rnd, args):
+    countries = [f"Country {i}" for i in range(args.countries)]
+    genres = [f"Genre {i}" for i in range(args.genres)]
+    languages = [f"Language {i}" for i in range(args.languages)]
+    films = dict()
+    while len(films) < args.films:
+        imdb_id = f"tt{rnd.randint(1, 19999999):07d}"
+        films[imdb_id] = {
+            'Title': f"Film {len(films)}",
+            'Year': str(rnd.randint(1900, 2024)),
+            'Runtime': f"{rnd.randint(5, 240)} min",
+            'Genre': ', '.join(rnd.sample(genres, min(len(genres), rnd.randint(1, 3)))),
+            'Director': f"Director {rnd.randrange(args.directors)}",
+            'Country': ', '.join(rnd.sample(countries, min(len(countries), rnd.randint(1, 2)))),
+            'Language': ', '.join(rnd.sample(languages, min(len(languages), rnd.randint(1, 2))))
+        }
+    return films
+
+
+def generate_challenge(root, args):
+    rnd = random.Random(args.seed)
+    films = generate_films(rnd, args)
+    imdb_ids = list(films)
+    popular = imdb_ids[:max(1, len(imdb_ids) // 10)]
+    users = [f"user{i}" for i in range(args.users)]
+
+    # <challenge>.csv is fully enriched for the report benchmarks, <challenge>_raw.csv leaves a share of
+    # the rows without OMDb info for the enrichment benchmark
+    with open(os.path.join(root, f"{args.challenge}.csv"), 'w', encoding='utf-8', newline='') as csvfile, \
+            open(os.path.join(root, f"{args.challenge}_raw.csv"), 'w', encoding='utf-8', newline='') as rawfile:
+        writer = csv.writer(csvfile, delimiter=';')
+        raw_writer = csv.writer(rawfile, delimiter=';')
+        writer.writerow(HEADER)
+        raw_writer.writerow(HEADER)
+        for _ in range(args.entries):
+            imdb_id = rnd.choice(popular) if rnd.random() < 0.3 else rnd.choice(imdb_ids)
+            row = [rnd.choice(users), f"https://www.imdb.com/title/{imdb_id}/", rnd.choice(FLAGS), '']
+            film = films[imdb_id]
+            info = [film[field][0:-len(' min')] if field == 'Runtime' else film[field] for field in HEADER[4:]]
+            writer.writerow(row + info)
+            raw_writer.writerow(row + ([''] * len(info) if rnd.random() < args.incomplete else info))
+
+    with open(os.path.join(root, f"{args.challenge}_recommendations.csv"), 'w', encoding='utf-8',
+              newline='') as csvfile:
+        writer = csv.writer(csvfile, delimiter=';')
+        writer.writerow(['user', 'imdb', 'Title', 'aka', 'Year'])
+        for imdb_id in rnd.sample(imdb_ids, min(len(imdb_ids), args.recommendations)):
+            writer.writerow([rnd.choice(users), f"https://www.imdb.com/title/{imdb_id}/",
+                             films[imdb_id]['Title'], '', films[imdb_id]['Year']])
+
+    lists_path = os.path.join(root, 'icm_lists', args.challenge)
+    os.makedirs(lists_path, exist_ok=True)
+    for i in range(args.lists):
+        with open(os.path.join(lists_path, f"list{i}.csv"), 'w', encoding='latin-1', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['rank', 'title', 'aka', 'year', 'official', 'checked', 'favorite', 'disliked',
+                             'watchlist', 'owned', 'url', 'imdburl'])
+            for rank, imdb_id in enumerate(rnd.sample(imdb_ids, min(len(imdb_ids), args.list_length))):
+                writer.writerow([rank + 1, films[imdb_id]['Title'], '', films[imdb_id]['Year']] + [''] * 7 +
+                                [f"https://www.imdb.com/title/{imdb_id}/"])
+    return films
+
+
+def create_omdb_tool(tool, filename, args, api_url):
+    # older versions of the tool do not take all of these arguments, the oldest cannot redirect the API url at all
+    parameters = inspect.signature(tool.OMDBInfoTool).parameters
+    kwargs = {'concurrency': args.concurrency, 'rate_limit': 0, 'api_url': api_url}
+    ot = tool.OMDBInfoTool(filename, **{key: value for key, value in kwargs.items() if key in parameters})
+    if 'api_url' in parameters:
+        return ot
+    if hasattr(ot, 'API_URL'):
+        ot.API_URL = api_url
+        return ot
+    return None
+
+
+def measure(func, repeat):
+    runs = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {'min': min(runs), 'median': statistics.median(runs), 'runs': runs}
+
+
+def measure_import(path, repeat):
+    # every import runs in a fresh interpreter, as a cold start of the tool would
+    runs = list()
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, path] + HEAVY_MODULES, capture_output=True,
+                                text=True, check=True).stdout.splitlines()
+        runs.append(float(output[0]))
+    return {'min': min(runs), 'median': statistics.median(runs), 'runs': runs,
+            'heavy_modules': output[1].split() if len(output) > 1 else []}
+
+
+def run_benchmarks(tool, root, films, args):
+    filename = f"{args.challenge}.csv"
+    raw_filename = f"{args.challenge}_raw.csv"
+    enrich_filename = f"{args.challenge}_enriched.csv"
+    results = {'import': measure_import(os.path.abspath(args.tool), args.repeat)}
+
+    server = omdb_stand_in.start_server(films, latency=args.omdb_latency, error_rate=args.omdb_error_rate,
+                                        throttle_rate=args.omdb_throttle_rate, seed=args.seed)
+
+    def enrich():
+        shutil.copy(raw_filename, enrich_filename)
+        create_omdb_tool(tool, enrich_filename, args, server.url).add_info_to_csv()
+
+    if create_omdb_tool(tool, raw_filename, args, server.url):
+        results['enrichment'] = measure(enrich, args.repeat)
+        results['enrichment']['omdb_requests'] = dict(server.stats)
+    else:
+        print('Skipping enrichment: this version of the tool cannot use a local OMDb server')
+    server.shutdown()
+
+    header, challenge_list = tool.open_csv(filename, ';')
+    _, recommendations = tool.open_csv(f"{args.challenge}_recommendations.csv", ';')
+    results['open_csv'] = measure(lambda: tool.open_csv(filename, ';'), args.repeat)
+
+    def construct():
+        ct = tool.IcmChallengeTool(header, challenge_list, args.challenge, recommendations=recommendations)
+        os.chdir(root)
+        return ct
+
+    results['construction'] = measure(construct, args.repeat)
+    ct = construct()
+    countries = [f"Country {i}" for i in range(args.countries)]
+    benchmarks = {
+        'print_leaderboard': lambda: ct.print_leaderboard(options=['recommendations']),
+        'print_table_of_most_frequent_entries': lambda: ct.print_table_of_most_frequent_entries(2),
+        'print_decade_breakdown': ct.print_decade_breakdown,
+        'print_misc_field_breakdown_table': lambda: ct.print_misc_field_breakdown_table('Country'),
+        'print_misc_field_breakdown_table_by_user': lambda: ct.print_misc_field_breakdown_table_by_user(
+            'Country', countries),
+        'get_recommendations_list': ct.get_recommendations_list,
+    }
+    for name, func in benchmarks.items():
+        results[name] = measure(func, args.repeat)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark IcmChallengeTool on a synthetic challenge.')
+    parser.add_argument('--challenge', default='bench')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--films', type=int, default=3000)
+    parser.add_argument('--incomplete', type=float, default=0.2, help='share of raw rows without OMDb info')
+    parser.add_argument('--countries', type=int, default=40)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--languages', type=int, default=30)
+    parser.add_argument('--directors', type=int, default=1000)
+    parser.add_argument('--lists', type=int, default=10)
+    parser.add_argument('--list-length', type=int, default=1000)
+    parser.add_argument('--recommendations', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--omdb-latency', type=float, default=0.0, help='seconds per stand-in OMDb response')
+    parser.add_argument('--omdb-error-rate', type=float, default=0.0, help='share of stand-in answers that are 503')
+    parser.add_argument('--omdb-throttle-rate', type=float, default=0.0, help='share of stand-in answers that are 429')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tool', default=TOOL_PATH, help='path of the icm-challenge-tool.py to benchmark')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tool = load_tool(args.tool)
+    output = os.path.abspath(args.output) if args.output else None
+    cwd = os.getcwd()
+    root = tempfile.mkdtemp(prefix='icm-bench-')
+    try:
+        films = generate_challenge(root, args)
+        os.chdir(root)
+        timings = run_benchmarks(tool, root, films, args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+    results = {
+        'tool': os.path.abspath(args.tool),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('tool', 'output')},
+        'timings': timings
+    }
+    for name, timing in timings.items():
+        print(f"{name:<45}{timing['median'] * 1000:>12.2f} ms")
+    print(f"Heavy modules imported with the tool: {', '.join(timings['import']['heavy_modules']) or 'none'}")
+    if 'enrichment' in timings:
+        print(f"Stand-in OMDb requests: {timings['enrichment']['omdb_requests']}")
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {output}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,70 @@
-import csv, yaml
+import argparse
+import csv
+import hashlib
+import html
+import io
+import json
+import mmap
 import os
-import statistics
-import requests
-import subprocess
-from collections import Counter
+import random
+import shutil
+import struct
+import sys
+from array import array
+from itertools import chain, count, islice
 import glob
 import re
-from tkinter import Tk
+import threading
+import time
+from contextlib import closing, contextmanager, nullcontext
 
+# requests, yaml, sqlite3, multiprocessing, subprocess and the profilers are imported by the code that needs them,
+# so that a report run starts without paying for HTTP, YAML or process pool imports
 
-def open_csv(file, delimiter, encoding='utf-8'):
-    result = list()
+
+def iter_csv(file, delimiter, encoding='utf-8'):
     with open(file, encoding=encoding) as csvfile:
-        for entry in csv.reader(csvfile, delimiter=delimiter):
-            result.append(entry)
-    return result[0], result[1:]
+        yield from csv.reader(csvfile, delimiter=delimiter)
+
+
+def open_csv_stream(file, delimiter, encoding='utf-8'):
+    # the header and an iterator that reads the remaining rows lazily, one at a time
+    rows = iter_csv(file, delimiter, encoding)
+    return next(rows), rows
+
+
+def open_csv(file, delimiter, encoding='utf-8'):
+    header, rows = open_csv_stream(file, delimiter, encoding)
+    return header, list(rows)
 
 
 def open_yaml(filename):
+    import yaml
     with open(f"{filename}.yaml") as file:
         return yaml.load(file, Loader=yaml.FullLoader)
 
 
-def write_to_clipboard_mac(output):
-    process = subprocess.Popen(
-        'pbcopy', env={'LANG': 'en_US.UTF-8'}, stdin=subprocess.PIPE)
-    process.communicate(output.encode('utf-8'))
+def get_clipboard_command():
+    if sys.platform == 'darwin':
+        return ['pbcopy']
+    if sys.platform == 'win32':
+        return ['clip']
+    if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-copy'):
+        return ['wl-copy']
+    if os.environ.get('DISPLAY') and shutil.which('xclip'):
+        return ['xclip', '-selection', 'clipboard']
+    return None
+
+
+def write_to_clipboard(output, fallback_file='clipboard.txt'):
+    command = get_clipboard_command()
+    if command is None:
+        with open(fallback_file, 'w', encoding='utf-8') as file:
+            file.write(output)
+        print(f"No clipboard available, content written to {fallback_file}")
+        return
+    import subprocess
+    subprocess.run(command, input=output.encode('utf-8'), env=dict(os.environ, LANG='en_US.UTF-8'), check=True)
     print('Content copied to clipboard!')
 
 
@@ -38,24 +77,333 @@ def get_imdb_id_from_url(url):
     return None
 
 
+def iter_rows_into_digest(digest, rows):
+    # yields the rows unchanged while adding each of them to digest
+    for row in rows:
+        digest.update('\x1f'.join(row).encode('utf-8'))
+        digest.update(b'\x1e')
+        yield row
+
+
+def get_rows_digest(header, rows):
+    digest = hashlib.sha1()
+    for _ in iter_rows_into_digest(digest, chain([header], rows)):
+        pass
+    return digest.hexdigest()
+
+
+def get_leading_rows_digest(header, rows, row_count):
+    # digest of the first row_count rows or None if there are fewer, reading no more than these rows
+    counter = count()
+    digest = get_rows_digest(header, (row for row, _ in zip(islice(rows, row_count), counter)))
+    return digest if next(counter) == row_count else None
+
+
+def get_imdb_number(imdb_id):
+    if imdb_id and imdb_id[2:].isdigit():
+        return int(imdb_id[2:])
+    return None
+
+
 def yield_lists(challenge_name):
-    dir_path = f"icm_lists/{challenge_name}/"
+    dir_path = os.path.join('icm_lists', challenge_name)
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
-    os.chdir(dir_path)
-    for filename in sorted(glob.glob(f"*.csv")):
-        yield filename[:-len('.csv')], os.path.join(os.getcwd(), filename)
+    for path in sorted(glob.glob(os.path.join(dir_path, '*.csv'))):
+        yield os.path.basename(path)[:-len('.csv')], os.path.abspath(path)
+
+
+# <name>.csv.idx: header followed by the sorted, distinct numeric IMDb ids of the list as uint32
+ICM_LIST_INDEX_HEADER = struct.Struct('=4sIqqI')  # magic, version, source mtime_ns, source size, count
+ICM_LIST_INDEX_MAGIC = b'ICML'
+ICM_LIST_INDEX_VERSION = 1
+
+
+def parse_icm_list(icm_list):
+    _, lst = open_csv_stream(icm_list, ',', encoding='latin-1')
+    imdb_numbers = set()
+    for entry in lst:
+        imdb_number = get_imdb_number(get_imdb_id_from_url(entry[11]))
+        imdb_numbers.add(imdb_number) if imdb_number is not None else None
+    return array('I', sorted(imdb_numbers))
+
+
+def read_icm_list_index(index_file, source_stat):
+    try:
+        with open(index_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, mtime, size, count = ICM_LIST_INDEX_HEADER.unpack_from(mm)
+            if (magic, version, mtime, size) != (ICM_LIST_INDEX_MAGIC, ICM_LIST_INDEX_VERSION,
+                                                 source_stat.st_mtime_ns, source_stat.st_size):
+                return None
+            imdb_numbers = array('I')
+            imdb_numbers.frombytes(mm[ICM_LIST_INDEX_HEADER.size:
+                                      ICM_LIST_INDEX_HEADER.size + count * imdb_numbers.itemsize])
+            return imdb_numbers if len(imdb_numbers) == count else None
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def write_icm_list_index(index_file, source_stat, imdb_numbers):
+    tmp_file = f"{index_file}.tmp"
+    with open(tmp_file, 'wb') as file:
+        file.write(ICM_LIST_INDEX_HEADER.pack(ICM_LIST_INDEX_MAGIC, ICM_LIST_INDEX_VERSION,
+                                              source_stat.st_mtime_ns, source_stat.st_size, len(imdb_numbers)))
+        imdb_numbers.tofile(file)
+    os.replace(tmp_file, index_file)
+
+
+def load_icm_list(icm_list):
+    source_stat = os.stat(icm_list)
+    index_file = f"{icm_list}.idx"
+    imdb_numbers = read_icm_list_index(index_file, source_stat)
+    if imdb_numbers is None:
+        with PROFILER.stage('parse icm list'):
+            imdb_numbers = parse_icm_list(icm_list)
+        try:
+            write_icm_list_index(index_file, source_stat, imdb_numbers)
+        except OSError:
+            pass
+    return imdb_numbers
+
+
+class Profiler:
+    # wall time, call count and peak traced memory per pipeline stage, latency histograms for single requests
+    LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = dict()
+        self.latencies = dict()
+        self.events = list()
+        self.frames = list()
+        self.cprofile_stage = None
+        self.cprofile = None
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+
+    def enable(self, cprofile_stage=None):
+        import cProfile
+        import tracemalloc
+        self.enabled = True
+        self.cprofile_stage = cprofile_stage
+        self.cprofile = cProfile.Profile() if cprofile_stage else None
+        self.start = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        return self.__measure_stage(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def __measure_stage(self, name):
+        # tracemalloc has a single peak, so every stage resets it and hands its own peak on to the enclosing stage
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        if self.frames:
+            self.frames[-1]['peak'] = max(self.frames[-1]['peak'], peak)
+        frame = {'memory': current, 'peak': current}
+        stats = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'peak_memory': 0})
+        self.frames.append(frame)
+        tracemalloc.reset_peak()
+        profile = self.cprofile if name == self.cprofile_stage else None
+        profile.enable() if profile else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            profile.disable() if profile else None
+            self.frames.pop()
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            if self.frames:
+                self.frames[-1]['peak'] = max(self.frames[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['peak_memory'] = max(stats['peak_memory'], peak - frame['memory'])
+            self.events.append({'stage': name, 'start': start - self.start, 'seconds': seconds,
+                                'depth': len(self.frames), 'peak_memory': peak - frame['memory']})
+
+    def record_latency(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.latencies.setdefault(name, list()).append(seconds)
+
+    def get_latency_stats(self, name):
+        latencies = sorted(self.latencies[name])
+        histogram = dict.fromkeys([f"<{bucket}ms" for bucket in self.LATENCY_BUCKETS_MS] +
+                                  [f">={self.LATENCY_BUCKETS_MS[-1]}ms"], 0)
+        for seconds in latencies:
+            bucket = next((b for b in self.LATENCY_BUCKETS_MS if seconds * 1000 < b), None)
+            histogram[f"<{bucket}ms" if bucket else f">={self.LATENCY_BUCKETS_MS[-1]}ms"] += 1
+        return {'count': len(latencies), 'min': latencies[0], 'median': latencies[len(latencies) // 2],
+                'max': latencies[-1], 'total': sum(latencies), 'histogram': histogram}
+
+    def get_trace(self):
+        return {'stages': self.stages, 'latencies': {name: self.get_latency_stats(name) for name in self.latencies},
+                'events': self.events}
+
+    def write_summary(self, file):
+        width = max([len('Stage')] + [len(name) for name in self.stages]) + 2
+        file.write(f"{'Stage':<{width}}{'Calls':>8}{'Total ms':>12}{'Peak KiB':>12}\n")
+        for name, stats in self.stages.items():
+            file.write(f"{name:<{width}}{stats['calls']:>8}{stats['seconds'] * 1000:>12.1f}"
+                       f"{stats['peak_memory'] / 1024:>12.0f}\n")
+        for name in self.latencies:
+            stats = self.get_latency_stats(name)
+            file.write(f"\n{name}: {stats['count']} requests, min {stats['min'] * 1000:.1f} ms, "
+                       f"median {stats['median'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms\n")
+            for bucket, count in stats['histogram'].items():
+                if count:
+                    file.write(f"  {bucket:>9} {count:>7} {'#' * max(1, 50 * count // stats['count'])}\n")
+
+    def write_trace(self, filename):
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump(self.get_trace(), file, indent=2)
+
+    def dump_cprofile(self, filename):
+        if self.cprofile:
+            self.cprofile.dump_stats(filename)
+
+
+PROFILER = Profiler()
+
+
+class RateLimiter:
+    # next_slot may be a multiprocessing.Value to share one limit between worker processes
+    def __init__(self, rate_limit, next_slot=None):
+        self.interval = 1 / rate_limit if rate_limit else 0
+        self.shared_slot = next_slot
+        self.next_slot = 0.0
+        self.lock = next_slot.get_lock() if next_slot is not None else threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            if self.shared_slot is not None:
+                slot = max(now, self.shared_slot.value)
+                self.shared_slot.value = slot + self.interval
+            else:
+                slot = max(now, self.next_slot)
+                self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class OMDBCache:
+    def __init__(self, filename='omdb_cache.sqlite', ttl=30 * 24 * 60 * 60, max_entries=100000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # autocommit and WAL so that several processes can share one cache file
+        import sqlite3
+        self.connection = sqlite3.connect(filename, timeout=60, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS omdb ("
+                                "imdb_id TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                                "fetched REAL NOT NULL, accessed REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS omdb_accessed ON omdb (accessed)")
+
+    def get(self, imdb_id):
+        with self.lock:
+            row = self.connection.execute("SELECT response, fetched FROM omdb WHERE imdb_id = ?",
+                                          (imdb_id,)).fetchone()
+            now = time.time()
+            if not row or (self.ttl and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE omdb SET accessed = ? WHERE imdb_id = ?", (now, imdb_id))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, imdb_id, response):
+        now = time.time()
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO omdb VALUES (?, ?, ?, ?)",
+                                    (imdb_id, json.dumps(response), now, now))
+
+    def save(self):
+        with self.lock:
+            if self.max_entries:
+                self.connection.execute("DELETE FROM omdb WHERE imdb_id IN (SELECT imdb_id FROM omdb "
+                                        "ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def get_stats(self):
+        return f"OMDb cache: {self.hits} hits, {self.misses} misses"
+
+
+class OMDBClient:
+    API_KEY = '3bf9939c'
+    API_URL = 'http://www.omdbapi.com/'
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, api_url=None, concurrency=8, rate_limiter=None, request_slots=None, timeout=(5, 30),
+                 retries=5, backoff=1.0):
+        self.api_url = api_url or self.API_URL
+        self.rate_limiter = rate_limiter or RateLimiter(None)
+        self.request_slots = request_slots or nullcontext()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        import requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, concurrency))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, imdb_id):
+        # the decoded OMDb answer, including 'Error' answers, or None if no answer could be obtained
+        import requests
+        for attempt in range(self.retries + 1):
+            try:
+                with self.request_slots:
+                    self.rate_limiter.wait()
+                    start = time.perf_counter()
+                    try:
+                        response = self.session.get(self.api_url, params={'i': imdb_id, 'apikey': self.API_KEY},
+                                                    timeout=self.timeout)
+                    finally:
+                        PROFILER.record_latency('omdb request', time.perf_counter() - start)
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = repr(e)
+                delay = self.backoff * 2 ** attempt
+            except (requests.RequestException, ValueError) as e:
+                print(f"Invalid OMDb response for {imdb_id}: {e!r}")
+                return None
+            if attempt < self.retries:
+                time.sleep(delay * random.uniform(0.5, 1.5))
+        print(f"Giving up on {imdb_id} after {self.retries + 1} attempts: {error}")
+        return None
 
 
 class OMDBInfoTool:
-    def __init__(self, filename):
-        self.API_KEY = '3bf9939c'
+    def __init__(self, filename, concurrency=8, rate_limit=10, cache=None, rate_limiter=None, request_slots=None,
+                 api_url=None, progress_every=100, checkpoint_interval=30):
         self.filename = filename
-        self.header, self.input = open_csv(self.filename, ';')
+        self.header, rows = open_csv_stream(self.filename, ';')
+        rows.close()
+        self.columns = {field: i for i, field in enumerate(self.header)}
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.progress_every = max(1, progress_every)
+        self.checkpoint_interval = checkpoint_interval
+        self.client = OMDBClient(api_url, self.concurrency, rate_limiter or RateLimiter(rate_limit), request_slots)
 
     def __get_field_from_entry(self, entry, field):
-        if field in self.header and entry[self.header.index(field)]:
-            return entry[self.header.index(field)]
+        column = self.columns.get(field)
+        if column is not None and entry[column]:
+            return entry[column]
         return None
 
     def __put_info_in_entry_field(self, entry, field, value):
@@ -64,290 +412,761 @@ class OMDBInfoTool:
         if not self.__get_field_from_entry(entry, field):
             if field == 'Runtime':
                 value = value[0:-len(' min')]
-            entry[self.header.index(field)] = value
+            entry[self.columns[field]] = value
 
     def __entry_has_all_fields(self, entry):
-        for field in self.header:
+        for field, column in self.columns.items():
             if field.islower():
                 continue
-            if not entry[self.header.index(field)]:
+            if not entry[column]:
                 return False
         return True
 
-    def add_info_to_csv(self):
-        for key, entry in enumerate(self.input):
-            imdb_link = self.__get_field_from_entry(entry, 'imdb')
-            imdb_id = get_imdb_id_from_url(imdb_link)
-            if not imdb_id:
+    def __get_incomplete_imdb_ids(self):
+        # every row is checked: rows whose lookup failed before are retried, the OMDb cache answers known ids
+        imdb_ids = dict()
+        _, rows = open_csv_stream(self.filename, ';')
+        for entry in rows:
+            imdb_id = get_imdb_id_from_url(self.__get_field_from_entry(entry, 'imdb'))
+            if imdb_id and not self.__entry_has_all_fields(entry):
+                imdb_ids[imdb_id] = None
+        return list(imdb_ids)
+
+    def __add_response_to_entry(self, entry, response):
+        for field in self.header:
+            if field in ('flags', 'user', 'checks', 'imdb'):
                 continue
-            if not self.__entry_has_all_fields(entry):
-                response = self.get_info_from_omdb_by_imdb_id(imdb_id)
-                if not response:
-                    continue
-                for field in self.header:
-                    if field in ('flags', 'user', 'checks', 'imdb'):
-                        continue
-                    value = response[field] if field in response else None
-                    self.__put_info_in_entry_field(entry, field, value)
-
-        self.__save_extended_csv_to_file()
-
-    def __save_extended_csv_to_file(self):
-        with open(self.filename, 'w+', encoding='utf-8', newline='') as csvfile:
+            value = response[field] if field in response else None
+            self.__put_info_in_entry_field(entry, field, value)
+
+    def add_info_to_csv(self):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        imdb_ids = self.__get_incomplete_imdb_ids()
+        pending_ids = iter(imdb_ids)
+        responses = dict()
+        done_count = 0
+        last_checkpoint = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                # a bounded window of lookups keeps every worker busy without queueing all ids up front
+                futures = {executor.submit(self.get_info_from_omdb_by_imdb_id, imdb_id): imdb_id
+                           for imdb_id in islice(pending_ids, 2 * self.concurrency)}
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        imdb_id = futures.pop(future)
+                        for next_imdb_id in islice(pending_ids, 1):
+                            futures[executor.submit(self.get_info_from_omdb_by_imdb_id, next_imdb_id)] = next_imdb_id
+                        done_count += 1
+                        try:
+                            response = future.result()
+                        except Exception as e:
+                            print(f"Could not add OMDb info for {imdb_id}: {e!r}")
+                            response = None
+                        if response:
+                            responses[imdb_id] = response
+                        if done_count % self.progress_every == 0 or done_count == len(imdb_ids):
+                            print(f"Looked up {done_count}/{len(imdb_ids)} IMDb ids")
+                    # every rewrite of the CSV streams the whole file, so it is saved at most every
+                    # checkpoint_interval seconds and once the run ends or is interrupted; the OMDb cache keeps the
+                    # answers in between
+                    if responses and time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                        self.__save_extended_csv_to_file(responses)
+                        responses = dict()
+                        last_checkpoint = time.monotonic()
+        finally:
+            if responses:
+                self.__save_extended_csv_to_file(responses)
+            if self.cache:
+                with PROFILER.stage('omdb cache save'):
+                    self.cache.save()
+
+    def __save_extended_csv_to_file(self, responses):
+        with PROFILER.stage('save csv'):
+            self.__write_csv(responses)
+
+    def __write_csv(self, responses):
+        # the rows are streamed from the CSV into a temporary file, which then atomically replaces the CSV
+        tmp_file = f"{self.filename}.tmp"
+        header, rows = open_csv_stream(self.filename, ';')
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as csvfile:
             writer = csv.writer(csvfile, delimiter=';')
-            writer.writerow(self.header)
-            writer.writerows(self.input)
+            writer.writerow(header)
+            for entry in rows:
+                response = responses.get(get_imdb_id_from_url(self.__get_field_from_entry(entry, 'imdb')))
+                if response:
+                    self.__add_response_to_entry(entry, response)
+                writer.writerow(entry)
+        os.replace(tmp_file, self.filename)
 
     def get_info_from_omdb_by_imdb_id(self, imdb_id):
-        req_url = f"http://www.omdbapi.com/?i={imdb_id}&apikey={self.API_KEY}"
-        response = requests.post(req_url)
-        if 'Error' in response.json():
-            print(response.json()['Error'], imdb_id)
+        response = self.cache.get(imdb_id) if self.cache else None
+        if response is None:
+            response = self.client.get(imdb_id)
+            if response is None:
+                return None
+            if self.cache:
+                self.cache.put(imdb_id, response)
+        if 'Error' in response:
+            print(response['Error'], imdb_id)
+            return None
+
+        return response
+
+
+BREAKDOWN_FIELDS = ('Country', 'Director', 'Genre', 'Language')
+
+
+def does_flags_increase_count(flags):
+    if flags and 's' in flags and 'c' not in flags:
+        return False
+    return True
+
+
+def get_runtime_for_flags(flags, runtime, has_runtime_field):
+    if flags and 'm' in flags:
+        return 0
+    if runtime >= 0:
+        return runtime
+    elif has_runtime_field:
+        if flags and 's' in flags:
+            return 5
+        else:
+            return 40
+    else:
+        return 0
+
+
+class ChallengeStore:
+    def __init__(self, header, rows=()):
+        self.header = header
+        self.columns = {field: i for i, field in enumerate(header)}
+        self.values = [list() for _ in header]
+        self.user_names = list()
+        self.user_codes = array('i')
+        self.imdb_ids = list()
+        self.imdb_numbers = list()
+        self.imdb_codes = array('i')
+        self.runtimes = array('i')
+        self.years = array('i')
+        self.__user_codes = dict()
+        self.__imdb_codes = dict()
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.user_codes)
+
+    def __iter__(self):
+        return (self.get_row(i) for i in range(len(self)))
+
+    def get_row(self, i):
+        return [column[i] for column in self.values]
+
+    def get_column(self, field):
+        return self.values[self.columns[field]] if field in self.columns else None
+
+    def get_value(self, i, field):
+        column = self.columns.get(field)
+        if column is not None and self.values[column][i]:
+            return self.values[column][i]
+        return None
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def append(self, row):
+        # everything is parsed before the columns grow, so a bad row cannot leave them with different lengths;
+        # a Runtime that is not a number counts as missing, like an empty one
+        row = [sys.intern(row[column]) if column < len(row) else '' for column in range(len(self.values))]
+        user_name, imdb_url, runtime, year = (row[self.columns[field]] if field in self.columns else ''
+                                              for field in ('user', 'imdb', 'Runtime', 'Year'))
+        runtime = int(runtime) if runtime.isdigit() else -1
+        year = int(year[0:4]) if year[0:4].isdigit() else -1
+        self.user_codes.append(self.__get_user_code(user_name or None))
+        self.imdb_codes.append(self.__get_imdb_code(get_imdb_id_from_url(imdb_url or None)))
+        self.runtimes.append(runtime)
+        self.years.append(year)
+        for values, value in zip(self.values, row):
+            values.append(value)
+
+    def __get_user_code(self, user_name):
+        if user_name not in self.__user_codes:
+            self.__user_codes[user_name] = len(self.user_names)
+            self.user_names.append(user_name)
+        return self.__user_codes[user_name]
+
+    def __get_imdb_code(self, imdb_id):
+        if not imdb_id:
+            return -1
+        if imdb_id not in self.__imdb_codes:
+            self.__imdb_codes[imdb_id] = len(self.imdb_ids)
+            self.imdb_ids.append(sys.intern(imdb_id))
+            self.imdb_numbers.append(get_imdb_number(imdb_id))
+        return self.__imdb_codes[imdb_id]
+
+
+class ChallengeAggregator:
+    def __init__(self, store, fields=(), icm_list_index=None, icm_list_count=0):
+        self.store = store
+        self.has_runtime_field = 'Runtime' in store.columns
+        self.icm_list_index = icm_list_index if icm_list_index is not None else dict()
+        self.icm_list_count = icm_list_count
+        self.users = dict()
+        self.films = dict()
+        self.yearly_counts = dict()
+        self.field_counts = {field: dict() for field in fields if field in store.columns}
+
+    def add(self, i):
+        store = self.store
+        user_name = store.user_names[store.user_codes[i]]
+        if user_name not in self.users:
+            self.users[user_name] = {
+                'count': 0,
+                'imdb_ids': list(),
+                'runtime': 0,
+                'icm_list_counts': [0] * self.icm_list_count
+            }
+        user = self.users[user_name]
+        flags = store.get_value(i, 'flags')
+        if does_flags_increase_count(flags):
+            user['count'] += 1
+        user['runtime'] += get_runtime_for_flags(flags, store.runtimes[i], self.has_runtime_field)
+        imdb_code = store.imdb_codes[i]
+        if imdb_code >= 0:
+            imdb_id = store.imdb_ids[imdb_code]
+            user['imdb_ids'].append(imdb_id)
+            self.__add_icm_list_counts(user['icm_list_counts'], store.imdb_numbers[imdb_code])
+            self.__add_film(i, imdb_id, user_name)
+
+        year = store.years[i]
+        if year >= 0:
+            year = str(year)
+        else:
+            year = store.get_value(i, 'Year')
+            year = year[0:4] if year else None
+        if year:
+            self.yearly_counts[year] = self.yearly_counts.get(year, 0) + 1
+
+        for field, counts in self.field_counts.items():
+            self.__add_field_values(counts, store.get_value(i, field))
+
+    def add_rows(self, start=0):
+        for i in range(start, len(self.store)):
+            self.add(i)
+
+    def set_icm_list_index(self, icm_list_index, icm_list_count):
+        # only the ICM list counts depend on the lists, so they are recounted from the users' films
+        self.icm_list_index = icm_list_index
+        self.icm_list_count = icm_list_count
+        for user in self.users.values():
+            user['icm_list_counts'] = [0] * icm_list_count
+            for imdb_id in user['imdb_ids']:
+                self.__add_icm_list_counts(user['icm_list_counts'], get_imdb_number(imdb_id))
+
+    def add_field(self, field):
+        counts = dict()
+        for field_values in self.store.get_column(field) or []:
+            self.__add_field_values(counts, field_values)
+        self.field_counts[field] = counts
+
+    def get_crosstab(self, field, values):
+        # user name -> count of entries whose field contains each value, matching substrings like the
+        # per-user breakdown; each distinct field string is matched against the values only once
+        rows = dict()
+        matches = dict()
+        for field_value, user_code in zip(self.store.get_column(field) or [], self.store.user_codes):
+            if not field_value:
+                continue
+            value_codes = matches.get(field_value)
+            if value_codes is None:
+                value_codes = matches[field_value] = [i for i, value in enumerate(values) if value in field_value]
+            if not value_codes:
+                continue
+            if user_code not in rows:
+                rows[user_code] = [0] * len(values)
+            row = rows[user_code]
+            for value_code in value_codes:
+                row[value_code] += 1
+        return {self.store.user_names[user_code]: row for user_code, row in rows.items()}
+
+    def __add_film(self, i, imdb_id, user_name):
+        if imdb_id not in self.films:
+            self.films[imdb_id] = {
+                'count': 0,
+                'watchers': set(),
+                'title': self.store.get_value(i, 'Title'),
+                'year': self.store.get_value(i, 'Year')
+            }
+        film = self.films[imdb_id]
+        film['count'] += 1
+        film['watchers'].add(user_name)
+
+    def get_state(self):
+        return {
+            'users': [[user_name, user] for user_name, user in self.users.items()],
+            'films': {imdb_id: dict(film, watchers=sorted(film['watchers'], key=str))
+                      for imdb_id, film in self.films.items()},
+            'yearly_counts': self.yearly_counts,
+            'field_counts': self.field_counts
+        }
+
+    def load_state(self, state):
+        self.users = {user_name: user for user_name, user in state['users']}
+        self.films = {imdb_id: dict(film, watchers=set(film['watchers'])) for imdb_id, film in state['films'].items()}
+        self.yearly_counts = state['yearly_counts']
+        self.field_counts = state['field_counts']
+
+    def __add_icm_list_counts(self, icm_list_counts, imdb_number):
+        mask = self.icm_list_index.get(imdb_number, 0)
+        while mask:
+            bit = mask & -mask
+            icm_list_counts[bit.bit_length() - 1] += 1
+            mask ^= bit
+
+    def __add_field_values(self, counts, field_values):
+        if not field_values:
+            return
+        for field_value in field_values.split(', '):
+            if field_value == 'N/A':
+                continue
+            counts[field_value] = counts.get(field_value, 0) + 1
+
+
+class ChallengeState:
+    VERSION = 1
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.state = self.__load()
+
+    def __load(self):
+        try:
+            with open(self.filename, encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
             return None
+        return state if state.get('version') == self.VERSION else None
+
+    def get_unchanged_row_count(self, header, rows, signature=None):
+        # number of leading rows that are identical to the ones the saved aggregates were built from; rows may be
+        # an iterator, of which only these leading rows are read
+        if not self.state or self.state['header'] != header:
+            return 0
+        if signature is not None and self.state['signature'] != signature:
+            return 0
+        row_count = self.state['row_count']
+        if get_leading_rows_digest(header, rows, row_count) != self.state['digest']:
+            return 0
+        return row_count
+
+    def get_aggregates(self):
+        return self.state['aggregates']
+
+    def save(self, header, rows, signature, aggregates):
+        self.state = {
+            'version': self.VERSION,
+            'header': header,
+            'row_count': len(rows),
+            'digest': get_rows_digest(header, rows),
+            'signature': signature,
+            'aggregates': aggregates
+        }
+        tmp_file = f"{self.filename}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file)
+        os.replace(tmp_file, self.filename)
+
+
+def get_imdb_link(imdb_id):
+    return Link(f"https://www.imdb.com/title/{imdb_id}/", 'IMDb', ':imdb:')
+
+
+def get_icm_link(imdb_id):
+    return Link(f"https://www.icheckmovies.com/search/movies/?query={imdb_id}/", 'ICM', ':ICM:')
+
+
+class Bold:
+    def __init__(self, text):
+        self.text = text
+
+
+class Link:
+    def __init__(self, url, text, icon=None):
+        self.url = url
+        self.text = text
+        self.icon = icon
+
+
+class Table:
+    # rows is called for every rendering, so the same table can be streamed to several outputs
+    def __init__(self, header, rows):
+        self.header = header
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows())
+
 
-        return response.json()
+class MultiSink:
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def write(self, text):
+        for sink in self.sinks:
+            sink.write(text)
+
+
+class Renderer:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def write_report(self, sections):
+        for title, table, spoiler in sections:
+            with PROFILER.stage(f"render {title or 'leaderboard'}"):
+                self.write_section(title, table, spoiler)
+
+    def format_text(self, value):
+        return '' if value is None else str(value)
+
+
+class BBCodeRenderer(Renderer):
+    def write_section(self, title, table, spoiler=False):
+        if spoiler:
+            self.sink.write(f"\n[spoiler={title}]")
+            self.write_table(table)
+            self.sink.write("[/spoiler]\n")
+        else:
+            self.sink.write(f"\n{title}:\n" if title else "\n")
+            self.write_table(table)
+            self.sink.write("\n")
+
+    def write_table(self, table):
+        self.sink.write("[table]\n[tr]" + ''.join(f"[td][b]\t{cell}\t[/b][/td]" for cell in table.header) + "[/tr]\n")
+        for row in table:
+            self.sink.write("[tr]" + ''.join(self.format_cell(cell) for cell in row) + "[/tr]\n")
+        self.sink.write("[/table]")
+
+    def format_cell(self, cell):
+        if isinstance(cell, Bold):
+            return f"[td][b]\t{cell.text}\t[/b][/td]"
+        if isinstance(cell, Link):
+            return f"[td]\t[url={cell.url}] {cell.icon or cell.text} [/url]\t[/td]"
+        return f"[td]\t{cell}\t[/td]"
+
+
+class MarkdownRenderer(Renderer):
+    def write_section(self, title, table, spoiler=False):
+        if spoiler:
+            self.sink.write(f"\n<details><summary>{title}</summary>\n\n")
+            self.write_table(table)
+            self.sink.write("\n</details>\n")
+        else:
+            self.sink.write(f"\n**{title}**\n\n" if title else "\n")
+            self.write_table(table)
+
+    def write_table(self, table):
+        self.sink.write('| ' + ' | '.join(self.format_cell(cell) for cell in table.header) + ' |\n')
+        self.sink.write('|' + '---|' * len(table.header) + '\n')
+        for row in table:
+            self.sink.write('| ' + ' | '.join(self.format_cell(cell) for cell in row) + ' |\n')
+
+    def format_cell(self, cell):
+        if isinstance(cell, Bold):
+            return f"**{self.format_cell(cell.text)}**"
+        if isinstance(cell, Link):
+            return f"[{cell.text}]({cell.url})"
+        return self.format_text(cell).replace('|', '\\|')
+
+
+class HTMLRenderer(Renderer):
+    def write_section(self, title, table, spoiler=False):
+        if spoiler:
+            self.sink.write(f"<details><summary>{html.escape(title)}</summary>\n")
+            self.write_table(table)
+            self.sink.write("</details>\n")
+        else:
+            self.sink.write(f"<h3>{html.escape(title)}</h3>\n" if title else "")
+            self.write_table(table)
+
+    def write_table(self, table):
+        self.sink.write("<table>\n<tr>" + ''.join(f"<th>{self.format_cell(cell)}</th>" for cell in table.header)
+                        + "</tr>\n")
+        for row in table:
+            self.sink.write("<tr>" + ''.join(f"<td>{self.format_cell(cell)}</td>" for cell in row) + "</tr>\n")
+        self.sink.write("</table>\n")
+
+    def format_cell(self, cell):
+        if isinstance(cell, Bold):
+            return f"<b>{self.format_cell(cell.text)}</b>"
+        if isinstance(cell, Link):
+            return f"<a href=\"{html.escape(cell.url)}\">{html.escape(cell.text)}</a>"
+        return html.escape(self.format_text(cell))
+
+
+class CSVRenderer(Renderer):
+    def __init__(self, sink):
+        super().__init__(sink)
+        self.writer = csv.writer(sink, delimiter=';')
+
+    def write_section(self, title, table, spoiler=False):
+        if title:
+            self.writer.writerow([title])
+        self.write_table(table)
+        self.writer.writerow([])
+
+    def write_table(self, table):
+        self.writer.writerow([self.format_cell(cell) for cell in table.header])
+        for row in table:
+            self.writer.writerow([self.format_cell(cell) for cell in row])
+
+    def format_cell(self, cell):
+        if isinstance(cell, Bold):
+            return self.format_cell(cell.text)
+        if isinstance(cell, Link):
+            return cell.url
+        return self.format_text(cell)
+
+
+RENDERERS = {
+    'bbcode': BBCodeRenderer,
+    'markdown': MarkdownRenderer,
+    'html': HTMLRenderer,
+    'csv': CSVRenderer
+}
+
+
+def render_table(table, output_format='bbcode'):
+    buffer = io.StringIO()
+    RENDERERS[output_format](buffer).write_table(table)
+    return buffer.getvalue()
+
+
+def sort_leader_list(user_count_list):
+    user_count_list = sorted(user_count_list, key=lambda k: (str.casefold(k[0])))
+    return sorted(user_count_list, key=lambda k: (k[1]), reverse=True)
+
+
+def get_leaderboard_position(count, i, last_count, last_i):
+    if i == 0:
+        return '-'
+    elif count == last_count:
+        return last_i
+    else:
+        return i
+
+
+def yield_leaderboard_rows(leader_list, get_user_cells):
+    # the first entry of the leader list is the overall row, which goes last
+    overall_row = None
+    last_count = 100000
+    last_i = 0
+    for i, (username, count) in enumerate(leader_list):
+        row = [get_leaderboard_position(count, i, last_count, last_i), username, count] + get_user_cells(username)
+        if last_count > count:
+            last_i = i
+            last_count = count
+
+        if i == 0:
+            overall_row = row
+        else:
+            yield row
+
+    if overall_row:
+        yield overall_row
+
+
+def sort_most_frequent_entries(input_list):
+    sorted_result = sorted(input_list, key=lambda k: (k[2]))
+    sorted_result = sorted(sorted_result, key=lambda k: (k[1]), reverse=True)
+    return sorted_result
+
+
+def get_decade_breakdown_from_yearly_breakdown(yearly_breakdown):
+    decade_counts = dict()
+    for year, count in yearly_breakdown:
+        decade = year[0:3] + '0s'
+        decade_counts[decade] = decade_counts[decade] + count if decade in decade_counts else count
+    return [(decade, count) for decade, count in decade_counts.items()]
+
+
+def get_most_frequent_entries_table(get_most_frequent_movies):
+    def yield_rows():
+        for imdb_id, count, title, year in get_most_frequent_movies():
+            yield [count, title, year, get_imdb_link(imdb_id), get_icm_link(imdb_id)]
+
+    return Table(['Times challenged', 'Name', 'Year', 'IMDB', 'ICM'], yield_rows)
+
+
+def get_decade_breakdown_table(get_decade_breakdown):
+    return Table(['Decade', 'Count'], lambda: ([decade, count] for decade, count in get_decade_breakdown()))
+
+
+def get_misc_field_breakdown_table(field, get_misc_field_breakdown, min_value=1):
+    def yield_rows():
+        field_breakdown = sorted(get_misc_field_breakdown(), key=lambda k: (k[1]), reverse=True)
+        for field_value, count in field_breakdown:
+            if count >= min_value:
+                yield [field_value, count]
+
+    return Table([field, 'Count'], yield_rows)
 
 
 class IcmChallengeTool:
-    def __init__(self, header, challenge_list, challenge_name, recommendations=None):
+    def __init__(self, header, challenge_list, challenge_name, recommendations=None,
+                 breakdown_fields=BREAKDOWN_FIELDS, state=None, icm_lists=None):
         self.challenge_name = challenge_name
         self.header = header
-        self.challenge_list = challenge_list
-        self.users = self.__create_users_dict()
-        self.icm_lists = self.__get_all_icm_lists()
+        # challenge_list may be a lazy row iterator, each row is only kept in the columns of the store
+        with PROFILER.stage('load csv'):
+            self.store = ChallengeStore(header, challenge_list)
+        with PROFILER.stage('load icm lists'):
+            self.icm_lists = icm_lists if icm_lists is not None else self.__get_all_icm_lists()
+        with PROFILER.stage('index icm lists'):
+            self.icm_list_index = self.__create_icm_list_index()
+        with PROFILER.stage('aggregate'):
+            self.aggregator = self.__aggregate(breakdown_fields, state)
+        self.__update_users()
+        self.films = self.aggregator.films
+        self.set_recommendations(recommendations)
+
+    def __update_users(self):
+        self.users = dict(self.aggregator.users)
         self.users['overall'] = self.get_overall()
+
+    def add_entries(self, challenge_list):
+        start = len(self.store)
+        self.store.extend(challenge_list)
+        self.aggregator.add_rows(start)
+        self.__update_users()
+
+    def set_recommendations(self, recommendations):
         self.recommendations = recommendations
+        self.recommendation_imdb_ids = {get_imdb_id_from_url(rec[1]) for rec in recommendations or []}
 
-    def __get_field_from_entry(self, entry, field):
-        if field in self.header and entry[self.header.index(field)]:
-            return entry[self.header.index(field)]
-        return None
+    def set_icm_lists(self, icm_lists):
+        self.icm_lists = icm_lists
+        self.icm_list_index = self.__create_icm_list_index()
+        self.aggregator.set_icm_list_index(self.icm_list_index, len(self.icm_lists))
+        self.__update_users()
 
     def __get_recommendations_watch_count(self, imdb_id):
-        all_imdb_ids = [get_imdb_id_from_url(self.__get_field_from_entry(entry, "imdb"))
-                        for _, entry in enumerate(self.challenge_list)]
-        watch_count = len(list(filter(lambda k: imdb_id == k, all_imdb_ids)))
-        return watch_count
+        return self.films[imdb_id]['count'] if imdb_id in self.films else 0
 
     def __get_recommendations_watch_count_for_user(self, user):
-        all_watched_imdb_ids = [entry for _, entry in enumerate(self.users[user]["imdb_ids"])]
-        all_recommendation_imdb_ids = [get_imdb_id_from_url(entry[1]) for entry in self.recommendations]
-        count = len([i for i in all_watched_imdb_ids if i in all_recommendation_imdb_ids])
-        return count
+        if user == 'overall':
+            return sum(self.__get_recommendations_watch_count(imdb_id) for imdb_id in self.recommendation_imdb_ids)
+        return len([i for i in self.users[user]['imdb_ids'] if i in self.recommendation_imdb_ids])
 
     def __get_all_icm_lists(self):
         icm_lists = dict()
         for list_name, icm_list in yield_lists(self.challenge_name):
-            _, lst = open_csv(icm_list, ',', encoding='latin-1')
-            imdb_ids = list()
-            for rank, entry in enumerate(lst):
-                imdb = get_imdb_id_from_url(entry[11])
-                imdb_ids.append(imdb) if imdb else None
-            icm_lists[list_name] = imdb_ids if imdb_ids else None
+            icm_lists[list_name] = load_icm_list(icm_list)
         return icm_lists
 
-    def __create_users_dict(self):
-        users = dict()
-        for entry in self.challenge_list:
-            user = self.__get_field_from_entry(entry, 'user')
-            if user not in users:
-                users[user] = {
-                    'count': 0,
-                    'imdb_ids': list(),
-                    'runtime': 0
-                }
-            if self.does_entry_increase_count(entry):
-                users[user]['count'] += 1
-            users[user]['runtime'] += self.__get_runtime_from_entry(entry)
-            imdb_id = get_imdb_id_from_url(self.__get_field_from_entry(entry, 'imdb'))
-            if imdb_id:
-                users[user]['imdb_ids'].append(imdb_id)
-
-        return users
-
-    def __get_runtime_from_entry(self, entry):
-        flags = self.__get_field_from_entry(entry, 'flags')
-        if flags and 'm' in flags:
-            return 0
-        runtime = self.__get_field_from_entry(entry, 'Runtime')
-        if runtime:
-            return int(runtime)
-        elif 'Runtime' in self.header:
-            if flags and 's' in flags:
-                return 5
-            else:
-                return 40
-        else:
-            return 0
+    def __create_icm_list_index(self):
+        # imdb number -> bitmask with bit i set if the film is in the i-th ICM list
+        index = dict()
+        for bit, imdb_numbers in enumerate(self.icm_lists.values()):
+            for imdb_number in imdb_numbers:
+                index[imdb_number] = index.get(imdb_number, 0) | 1 << bit
+        return index
 
-    def does_entry_increase_count(self, entry):
-        flags = self.__get_field_from_entry(entry, 'flags')
-        if flags and 's' in flags and 'c' not in flags:
-            return False
-        return True
+    def __get_icm_lists_signature(self):
+        signature = list()
+        for list_name, icm_list in yield_lists(self.challenge_name):
+            source_stat = os.stat(icm_list)
+            signature.append([list_name, source_stat.st_mtime_ns, source_stat.st_size])
+        return signature
+
+    def __aggregate(self, breakdown_fields, state=None):
+        aggregator = ChallengeAggregator(self.store, breakdown_fields, self.icm_list_index, len(self.icm_lists))
+        start = 0
+        if state:
+            signature = {'fields': sorted(aggregator.field_counts), 'icm_lists': self.__get_icm_lists_signature()}
+            start = state.get_unchanged_row_count(self.header, self.store, signature)
+            if start:
+                aggregator.load_state(state.get_aggregates())
+        aggregator.add_rows(start)
+        if state:
+            state.save(self.header, self.store, signature, aggregator.get_state())
+        return aggregator
 
     def get_overall(self):
-        overall = {'count': sum(user['count'] for _, user in self.users.items()),
-                   'imdb_ids': list(),
-                   'runtime': sum(user['runtime'] for _, user in self.users.items())
+        users = [user for user_name, user in self.users.items() if user_name != 'overall']
+        # the films of all users are in self.films, so overall does not repeat the users' imdb_ids
+        overall = {'count': sum(user['count'] for user in users),
+                   'runtime': sum(user['runtime'] for user in users),
+                   'icm_list_counts': [sum(user['icm_list_counts'][i] for user in users)
+                                       for i in range(len(self.icm_lists))]
                    }
-        overall['imdb_ids'].extend(
-            imdb_id for _, user in self.users.items() for imdb_id in user['imdb_ids'])
         return overall
 
     def get_leader_list(self):
-        user_count_list = [(user_name, user['count']) for user_name, user in self.users.items()]
-        user_count_list = sorted(user_count_list, key=lambda k: (str.casefold(k[0])))
-        return sorted(user_count_list, key=lambda k: (k[1]), reverse=True)
+        return sort_leader_list([(user_name, user['count']) for user_name, user in self.users.items()])
 
     def get_count_of_entries_in_icm_list(self, username, list_name):
-        imdbs = [imdb for imdb in self.users[username]['imdb_ids'] if imdb in self.icm_lists[list_name]]
-        return len(imdbs)
+        return self.users[username]['icm_list_counts'][list(self.icm_lists).index(list_name)]
 
-    def get_user_runtime_cell(self, username):
-        if self.users['overall']['runtime'] <= 0:
-            return ''
-        else:
-            return f"[td]\t{self.users[username]['runtime']}\t[/td]"
-
-    def print_leaderboard(self, options=None):
+    def get_leaderboard_table(self, options=None):
         if options is None:
             options = []
-        leader_list = self.get_leader_list()
-        leaderboard = f"[table]\n[tr][td][b]\tRank\t[/b][/td][td][b]\tParticipant\t[/b][/td][td][b]\tCount\t[/b][/td]"
-        leaderboard += f"{self.__get_recommendations_leaderboard_header_cell()}" if 'recommendations' in options else ''
-        leaderboard += f"[td][b]\tMinutes\t[/b][/td]" if 'Runtime' in self.header else ''
-        leaderboard += f"{self.__get_icm_list_name_cells()}"
-        leaderboard += f"[/tr]\n"
-        overall_row = ''
-        last_count = 100000
-        last_i = 0
-        for i, (username, count) in enumerate(leader_list):
-            row = f"[tr][td]\t{self.__get_position(count, i, last_count, last_i)}\t[/td]" \
-                  f"[td]\t{username}\t[/td]" \
-                  f"[td]\t{count}\t[/td]"
-            row += f"{self.__get_recommendations_leaderboard_cell(username)}" if 'recommendations' in options else ''
-            row += self.get_user_runtime_cell(username)
-            row += self.__get_count_in_icm_list_cells(username)
-            row += f"[/tr]\n"
-            if last_count > count:
-                last_i = i
-                last_count = count
-
-            if i == 0:
-                overall_row = row
-            else:
-                leaderboard += row
+        header = ['Rank', 'Participant', 'Count']
+        header += ['Recommendations'] if 'recommendations' in options else []
+        header += ['Minutes'] if 'Runtime' in self.header else []
+        header += [list_name.replace('--', '<') for list_name in self.icm_lists]
+        return Table(header, lambda: yield_leaderboard_rows(self.get_leader_list(),
+                                                            lambda username: self.__get_user_cells(username, options)))
+
+    def __get_user_cells(self, username, options):
+        cells = [self.__get_recommendations_watch_count_for_user(username)] if 'recommendations' in options else []
+        cells += [self.users[username]['runtime']] if self.users['overall']['runtime'] > 0 else []
+        return cells + self.users[username]['icm_list_counts']
 
-        leaderboard += overall_row + '[/table]'
-        return leaderboard
+    def print_leaderboard(self, options=None):
+        return render_table(self.get_leaderboard_table(options))
 
     def get_most_frequent_movies(self, minimum_frequency):
-        counter = Counter(self.users['overall']['imdb_ids'])
-        result = counter.most_common()
+        result = sorted(((imdb_id, film['count']) for imdb_id, film in self.films.items()),
+                        key=lambda k: (k[1]), reverse=True)
         result_filter_frequency = [x for x in result if x[1] >= minimum_frequency]
         result_with_title_and_year = [x + (self.__get_title_and_year_from_imdb_id(x[0])) for x in
                                       result_filter_frequency]
-        sorted_result = self.__sort_most_frequent_entries(result_with_title_and_year)
-        return sorted_result
+        return sort_most_frequent_entries(result_with_title_and_year)
 
-    def __sort_most_frequent_entries(self, input_list):
-        sorted_result = sorted(input_list, key=lambda k: (k[2]))
-        sorted_result = sorted(sorted_result, key=lambda k: (k[1]), reverse=True)
-        return sorted_result
+    def get_most_frequent_entries_table(self, minimum_freq):
+        return get_most_frequent_entries_table(lambda: self.get_most_frequent_movies(minimum_freq))
 
     def print_table_of_most_frequent_entries(self, minimum_freq):
-        most_freq_list = self.get_most_frequent_movies(minimum_freq)
-        table = f"[table]\n[tr][td][b]\tTimes challenged\t[/b][/td][td][b]\tName\t[/b][/td][td][b]\tYear\t[/b][/td]" \
-                f"[td][b]IMDB[/b][/td][td][b]ICM[/b][/td][/tr]\n"
-        for imdb_id, count, title, year in most_freq_list:
-            row = f"[tr][td]\t{count}\t[/td]" \
-                  f"[td]\t{title}\t[/td]" \
-                  f"[td]\t{year}\t[/td]" \
-                  f"{self.__get_imdb_cell(imdb_id)}" \
-                  f"{self.__get_icm_cell(imdb_id)}" \
-                  f"[/tr]\n"
-            table += row
-
-        table += '[/table]'
-        return table
-
-    def __get_position(self, count, i, last_count, last_i):
-        if i == 0:
-            return '-'
-        elif count == last_count:
-            return last_i
-        else:
-            return i
-
-    def __get_icm_list_name_cells(self):
-        result = ''
-        for list_name in self.icm_lists:
-            result += f"[td][b]\t{list_name.replace('--', '<')}\t[/b][/td]"
-        return result
-
-    def __get_count_in_icm_list_cells(self, username):
-        result = ''
-        for list_name in self.icm_lists:
-            result += f"[td]\t{self.get_count_of_entries_in_icm_list(username, list_name)}\t[/td]"
-        return result
+        return render_table(self.get_most_frequent_entries_table(minimum_freq))
 
     def __get_title_and_year_from_imdb_id(self, imdb_id):
-        for entry in self.challenge_list:
-            if get_imdb_id_from_url(self.__get_field_from_entry(entry, 'imdb')) == imdb_id:
-                return self.__get_field_from_entry(entry, 'Title'), self.__get_field_from_entry(entry, 'Year')
+        if imdb_id in self.films:
+            return self.films[imdb_id]['title'], self.films[imdb_id]['year']
         return None, None
 
     def get_yearly_breakdown(self):
-        yearly_counts = dict()
-        for _, entry in enumerate(self.challenge_list):
-            year = self.__get_field_from_entry(entry, 'Year')
-            if year:
-                year = year[0:4]
-                yearly_counts[year] = yearly_counts[year] + 1 if year in yearly_counts else 1
-        yearly_breakdown = [(year, count) for year, count in yearly_counts.items()]
-        return sorted(yearly_breakdown)
+        return sorted(self.aggregator.yearly_counts.items())
 
     def get_decade_breakdown(self):
-        yearly_breakdown = self.get_yearly_breakdown()
-        decade_counts = dict()
-        for year, count in yearly_breakdown:
-            decade = year[0:3] + '0s'
-            decade_counts[decade] = decade_counts[decade] + count if decade in decade_counts else count
-        return [(decade, count) for decade, count in decade_counts.items()]
+        return get_decade_breakdown_from_yearly_breakdown(self.get_yearly_breakdown())
+
+    def get_decade_breakdown_table(self):
+        return get_decade_breakdown_table(self.get_decade_breakdown)
 
     def print_decade_breakdown(self):
-        decade_breakdown = self.get_decade_breakdown()
-        table = f"[table]\n[tr][td][b]\tDecade\t[/b][/td][td][b]\tCount\t[/b][/td][/tr]\n"
-        for decade, count in decade_breakdown:
-            table += f"[tr][td]\t{decade}\t[/td][td]\t{count}\t[/td][/tr]\n"
-        table += "[/table]"
-        return table
+        return render_table(self.get_decade_breakdown_table())
 
     def get_misc_field_breakdown(self, field):
-        field_counts = dict()
-        for _, entry in enumerate(self.challenge_list):
-            field_values = self.__get_field_from_entry(entry, field)
-            if not field_values:
-                continue
-            field_values = field_values.split(', ')
-            for field_value in field_values:
-                if field_value == 'N/A':
-                    continue
-                field_counts[field_value] = field_counts[field_value] + 1 if field_value in field_counts else 1
-        field_breakdown = [(field_value, count) for field_value, count in field_counts.items()]
-        return sorted(field_breakdown)
+        if field not in self.aggregator.field_counts:
+            self.aggregator.add_field(field)
+        return sorted(self.aggregator.field_counts[field].items())
+
+    def get_misc_field_breakdown_table(self, field, min_value=1):
+        return get_misc_field_breakdown_table(field, lambda: self.get_misc_field_breakdown(field), min_value)
 
     def print_misc_field_breakdown_table(self, field, min_value=1):
-        field_breakdown = self.get_misc_field_breakdown(field)
-        field_breakdown = sorted(field_breakdown, key=lambda k: (k[1]), reverse=True)
-        table = f"[table]\n[tr][td][b]\t{field}\t[/b][/td][td][b]\tCount\t[/b][/td][/tr]\n"
-        for field_value, count in field_breakdown:
-            if count < min_value:
-                continue
-            table += f"[tr][td]\t{field_value}\t[/td][td]\t{count}\t[/td][/tr]\n"
-        table += "[/table]"
-        return table
+        return render_table(self.get_misc_field_breakdown_table(field, min_value))
 
     def __get_alphabetical_user_list(self):
         def take_lower(elem):
@@ -356,119 +1175,665 @@ class IcmChallengeTool:
         user_list = [user_name for user_name in self.users if user_name != 'overall']
         return sorted(user_list, key=take_lower)
 
+    def get_misc_field_crosstab(self, field, values):
+        crosstab = self.aggregator.get_crosstab(field, values)
+        crosstab[None] = [sum(counts[i] for counts in crosstab.values()) for i in range(len(values))]
+        return crosstab
+
     def get_misc_field_count_for_value_for_user(self, user, field, value):
-        all_entries_for_field = [self.__get_field_from_entry(entry, field) for _, entry in
-                                 enumerate(self.challenge_list)
-                                 if not user or self.__get_field_from_entry(entry, 'user') == user]
-        return len([1 for i in all_entries_for_field if i and value in i])
+        crosstab = self.get_misc_field_crosstab(field, [value])
+        return crosstab[user][0] if user in crosstab else 0
+
+    def get_misc_field_breakdown_table_by_user(self, field, allowed_values):
+        def yield_rows():
+            crosstab = self.get_misc_field_crosstab(field, allowed_values)
+            empty_row = [0] * len(allowed_values)
+            for user_name in self.__get_alphabetical_user_list():
+                yield [Bold(user_name)] + crosstab.get(user_name, empty_row)
+            yield [Bold('Overall')] + crosstab[None]
+
+        return Table(['username'] + list(allowed_values), yield_rows)
 
     def print_misc_field_breakdown_table_by_user(self, field, allowed_values):
-        user_list = self.__get_alphabetical_user_list()
-        table = f"[table]\n[tr][td][b]\tusername\t[/b][/td]"
-        for val in allowed_values:
-            table += f"[td][b]\t{val}\t[/b][/td]"
-        table += "[/tr]\n"
-
-        for user_name in user_list:
-            table += f"[tr][td][b]\t{user_name}\t[/b][/td]"
-            for val in allowed_values:
-                table += f"[td]\t{self.get_misc_field_count_for_value_for_user(user_name, field, val)}\t[/td]"
-            table += f"[/tr]\n"
-
-        table += f"[tr][td][b]\tOverall\t[/b][/td]"
-        for val in allowed_values:
-            table += f"[td]\t{self.get_misc_field_count_for_value_for_user(None, field, val)}\t[/td]"
-        table += f"[/tr]\n[/table]"
-        return table
-
-    def __get_recommendations_leaderboard_header_cell(self):
-        return f"[td][b]\tRecommendations\t[/b][/td]"
-
-    def __get_recommendations_leaderboard_cell(self, user):
-        count = self.__get_recommendations_watch_count_for_user(user)
-        return f"[td]\t{count}\t[/td]"
+        return render_table(self.get_misc_field_breakdown_table_by_user(field, allowed_values))
+
+    def get_recommendations_table(self):
+        def yield_rows():
+            for rec in sorted(self.recommendations, key=lambda k: (k[2])):
+                imdb_id = get_imdb_id_from_url(rec[1])
+                yield [rec[2], rec[3], rec[4], rec[0], self.__get_recommendations_watch_count(imdb_id),
+                       get_imdb_link(imdb_id), get_icm_link(imdb_id)]
+
+        return Table(['Title', 'aka', 'Year', 'Recommended by', 'Times watched', 'IMDB', 'ICM'], yield_rows)
 
     def get_recommendations_list(self):
-        table = "[table]\n[tr][td][b]\tTitle\t[/b][/td][td][b]\taka\t[/b][/td][td][b]\tYear\t[/b][/td]"
-        table += "[td][b]\tRecommended by\t[/b][/td][td][b]\tTimes watched\t[/b][/td]"
-        table += "[td][b]\tIMDB\t[/b][/td][td][b]\tICM\t[/b][/td][/tr]\n"
-        recs = sorted(self.recommendations, key=lambda k: (k[2]))
-        for rec in recs:
-            imdb_id = get_imdb_id_from_url(rec[1])
-            table += f"[tr][td]\t{rec[2]}\t[/td][td]\t{rec[3]}\t[/td][td]\t{rec[4]}\t[/td]"
-            table += f"[td]\t{rec[0]}\t[/td][td]\t{self.__get_recommendations_watch_count(imdb_id)}\t[/td]"
-            table += f"{self.__get_imdb_cell(imdb_id)}{self.__get_icm_cell(imdb_id)}[/tr]\n"
-        table += "[/table]"
-        return table
+        return render_table(self.get_recommendations_table())
+
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS challenges (
+    name TEXT PRIMARY KEY, has_runtime INTEGER NOT NULL, row_count INTEGER NOT NULL, imported REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS entries (
+    challenge TEXT NOT NULL, row INTEGER NOT NULL, user TEXT, imdb_id TEXT, imdb_number INTEGER,
+    counted INTEGER NOT NULL, runtime INTEGER NOT NULL, title TEXT, year TEXT, PRIMARY KEY (challenge, row));
+CREATE TABLE IF NOT EXISTS entry_fields (
+    challenge TEXT NOT NULL, row INTEGER NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS entry_field_values (
+    challenge TEXT NOT NULL, row INTEGER NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS icm_lists (
+    challenge TEXT NOT NULL, list_name TEXT NOT NULL, position INTEGER NOT NULL, imdb_number INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS recommendations (
+    challenge TEXT NOT NULL, user TEXT, imdb_id TEXT, title TEXT, aka TEXT, year TEXT);
+CREATE INDEX IF NOT EXISTS entries_imdb_id ON entries (imdb_id);
+CREATE INDEX IF NOT EXISTS entries_user ON entries (user, challenge);
+CREATE INDEX IF NOT EXISTS entries_imdb_number ON entries (challenge, imdb_number);
+CREATE INDEX IF NOT EXISTS entry_fields_field ON entry_fields (challenge, field);
+CREATE INDEX IF NOT EXISTS entry_field_values_field ON entry_field_values (field, challenge);
+CREATE INDEX IF NOT EXISTS icm_lists_imdb_number ON icm_lists (challenge, imdb_number);
+CREATE INDEX IF NOT EXISTS recommendations_imdb_id ON recommendations (challenge, imdb_id);
+"""
+ARCHIVE_TABLES = ('entries', 'entry_fields', 'entry_field_values', 'icm_lists', 'recommendations', 'challenges')
+
+
+class ChallengeArchive:
+    # every query method takes an optional challenge name and covers all imported challenges without one
+    def __init__(self, filename='challenges.sqlite'):
+        import sqlite3
+        self.connection = sqlite3.connect(filename)
+        self.connection.executescript(ARCHIVE_SCHEMA)
+
+    def import_challenge(self, challenge_name, header, challenge_list, recommendations=None):
+        store = ChallengeStore(header, challenge_list)
+        has_runtime_field = 'Runtime' in store.columns
+        fields = [field for field in header if not field.islower() and field not in ('Title', 'Year', 'Runtime')]
+        with self.connection:
+            for table in ARCHIVE_TABLES:
+                column = 'name' if table == 'challenges' else 'challenge'
+                self.connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (challenge_name,))
+            self.connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        self.__yield_entries(challenge_name, store, has_runtime_field))
+            self.connection.executemany("INSERT INTO entry_fields VALUES (?, ?, ?, ?)",
+                                        ((challenge_name, i, field, store.get_value(i, field))
+                                         for field in fields for i in range(len(store)) if store.get_value(i, field)))
+            self.connection.executemany("INSERT INTO entry_field_values VALUES (?, ?, ?, ?)",
+                                        ((challenge_name, i, field, value)
+                                         for field in fields for i in range(len(store))
+                                         for value in (store.get_value(i, field) or '').split(', ')
+                                         if value and value != 'N/A'))
+            for position, (list_name, icm_list) in enumerate(yield_lists(challenge_name)):
+                self.connection.executemany("INSERT INTO icm_lists VALUES (?, ?, ?, ?)",
+                                            ((challenge_name, list_name, position, imdb_number)
+                                             for imdb_number in load_icm_list(icm_list)))
+            self.connection.executemany("INSERT INTO recommendations VALUES (?, ?, ?, ?, ?, ?)",
+                                        ((challenge_name, rec[0], get_imdb_id_from_url(rec[1]), rec[2], rec[3],
+                                          rec[4]) for rec in recommendations or []))
+            self.connection.execute("INSERT INTO challenges VALUES (?, ?, ?, ?)",
+                                    (challenge_name, int(has_runtime_field), len(store), time.time()))
+        return len(store)
+
+    def __yield_entries(self, challenge_name, store, has_runtime_field):
+        for i in range(len(store)):
+            flags = store.get_value(i, 'flags')
+            imdb_code = store.imdb_codes[i]
+            yield (challenge_name, i, store.user_names[store.user_codes[i]],
+                   store.imdb_ids[imdb_code] if imdb_code >= 0 else None,
+                   store.imdb_numbers[imdb_code] if imdb_code >= 0 else None,
+                   int(does_flags_increase_count(flags)),
+                   get_runtime_for_flags(flags, store.runtimes[i], has_runtime_field),
+                   store.get_value(i, 'Title'), store.get_value(i, 'Year'))
+
+    def __query(self, sql, challenge=None, parameters=(), column='challenge'):
+        # sql contains a {where} placeholder for the optional challenge condition
+        if challenge is None:
+            return self.connection.execute(sql.format(where='1'), parameters).fetchall()
+        return self.connection.execute(sql.format(where=f"{column} = ?"), tuple(parameters) + (challenge,)).fetchall()
+
+    def get_challenges(self):
+        return [name for name, in self.connection.execute("SELECT name FROM challenges ORDER BY name")]
+
+    def get_users(self, challenge=None):
+        # in order of first appearance, like the users of IcmChallengeTool
+        users = {user: {'count': count, 'runtime': runtime} for user, count, runtime, _ in self.__query(
+            "SELECT user, SUM(counted), SUM(runtime), MIN(rowid) FROM entries WHERE {where} GROUP BY user ORDER BY 4",
+            challenge)}
+        users['overall'] = {'count': sum(user['count'] for user in users.values()),
+                            'runtime': sum(user['runtime'] for user in users.values())}
+        return users
+
+    def get_leader_list(self, challenge=None):
+        return sort_leader_list([(user_name, user['count']) for user_name, user in self.get_users(challenge).items()])
+
+    def get_user_runtime(self, user, challenge=None):
+        rows = self.__query("SELECT SUM(runtime) FROM entries WHERE user = ? AND {where}", challenge, (user,))
+        return rows[0][0] or 0
+
+    def get_user_challenges(self, user):
+        return self.connection.execute("SELECT challenge, SUM(counted), SUM(runtime) FROM entries WHERE user = ? "
+                                       "GROUP BY challenge ORDER BY challenge", (user,)).fetchall()
+
+    def get_icm_list_names(self, challenge):
+        return [list_name for list_name, in self.connection.execute(
+            "SELECT DISTINCT list_name FROM icm_lists WHERE challenge = ? ORDER BY position", (challenge,))]
+
+    def get_icm_list_counts(self, challenge):
+        icm_list_count = len(self.get_icm_list_names(challenge))
+        counts = dict()
+        for user, position, count in self.connection.execute(
+                "SELECT e.user, l.position, COUNT(*) FROM entries e JOIN icm_lists l "
+                "ON l.challenge = e.challenge AND l.imdb_number = e.imdb_number "
+                "WHERE e.challenge = ? GROUP BY e.user, l.position", (challenge,)):
+            counts.setdefault(user, [0] * icm_list_count)[position] = count
+        counts['overall'] = [sum(user_counts[i] for user_counts in counts.values()) for i in range(icm_list_count)]
+        return counts
+
+    def get_recommendations_watch_counts(self, challenge=None):
+        counts = dict(self.__query(
+            "SELECT e.user, COUNT(*) FROM entries e JOIN (SELECT DISTINCT challenge, imdb_id FROM recommendations) r "
+            "ON r.challenge = e.challenge AND r.imdb_id = e.imdb_id WHERE {where} GROUP BY e.user",
+            challenge, column='e.challenge'))
+        counts['overall'] = sum(counts.values())
+        return counts
+
+    def get_yearly_breakdown(self, challenge=None):
+        return sorted(self.__query("SELECT substr(year, 1, 4), COUNT(*) FROM entries "
+                                   "WHERE year IS NOT NULL AND {where} GROUP BY 1", challenge))
+
+    def get_decade_breakdown(self, challenge=None):
+        return get_decade_breakdown_from_yearly_breakdown(self.get_yearly_breakdown(challenge))
+
+    def get_misc_field_breakdown(self, field, challenge=None):
+        return sorted(self.__query("SELECT value, COUNT(*) FROM entry_field_values "
+                                   "WHERE field = ? AND {where} GROUP BY value", challenge, (field,)))
+
+    def get_most_frequent_movies(self, minimum_frequency, challenge=None):
+        # SQLite takes the bare title and year columns from the row that matches MIN(rowid), the first import
+        rows = self.__query("SELECT imdb_id, COUNT(*), title, year, MIN(rowid) FROM entries "
+                            "WHERE imdb_id IS NOT NULL AND {where} GROUP BY imdb_id", challenge)
+        return sort_most_frequent_entries([row[:4] for row in rows if row[1] >= minimum_frequency])
+
+    def get_misc_field_crosstab(self, field, values, challenge=None):
+        crosstab = dict()
+        for i, value in enumerate(values):
+            for user, count in self.__query(
+                    "SELECT e.user, COUNT(*) FROM entry_fields f JOIN entries e "
+                    "ON e.challenge = f.challenge AND e.row = f.row "
+                    "WHERE f.field = ? AND instr(f.value, ?) > 0 AND {where} GROUP BY e.user",
+                    challenge, (field, value), column='f.challenge'):
+                crosstab.setdefault(user, [0] * len(values))[i] = count
+        crosstab[None] = [sum(counts[i] for counts in crosstab.values()) for i in range(len(values))]
+        return crosstab
+
+    def get_leaderboard_table(self, challenge=None, options=None):
+        if options is None:
+            options = []
+        users = self.get_users(challenge)
+        has_runtime_field = any(has_runtime for has_runtime, in self.__query(
+            "SELECT has_runtime FROM challenges WHERE {where}", challenge, column='name'))
+        icm_list_names = self.get_icm_list_names(challenge) if challenge is not None else []
+        icm_list_counts = self.get_icm_list_counts(challenge) if icm_list_names else dict()
+        recommendation_counts = self.get_recommendations_watch_counts(challenge) if 'recommendations' in options \
+            else dict()
+
+        def get_user_cells(username):
+            cells = [recommendation_counts.get(username, 0)] if 'recommendations' in options else []
+            cells += [users[username]['runtime']] if users['overall']['runtime'] > 0 else []
+            return cells + icm_list_counts.get(username, [0] * len(icm_list_names))
+
+        header = ['Rank', 'Participant', 'Count']
+        header += ['Recommendations'] if 'recommendations' in options else []
+        header += ['Minutes'] if has_runtime_field else []
+        header += [list_name.replace('--', '<') for list_name in icm_list_names]
+        return Table(header, lambda: yield_leaderboard_rows(self.get_leader_list(challenge), get_user_cells))
+
+    def get_most_frequent_entries_table(self, minimum_freq, challenge=None):
+        return get_most_frequent_entries_table(lambda: self.get_most_frequent_movies(minimum_freq, challenge))
+
+    def get_decade_breakdown_table(self, challenge=None):
+        return get_decade_breakdown_table(lambda: self.get_decade_breakdown(challenge))
+
+    def get_misc_field_breakdown_table(self, field, min_value=1, challenge=None):
+        return get_misc_field_breakdown_table(field, lambda: self.get_misc_field_breakdown(field, challenge), min_value)
+
+    def get_misc_field_breakdown_table_by_user(self, field, allowed_values, challenge=None):
+        def yield_rows():
+            crosstab = self.get_misc_field_crosstab(field, allowed_values, challenge)
+            empty_row = [0] * len(allowed_values)
+            for user_name in sorted((user for user in self.get_users(challenge) if user != 'overall'),
+                                    key=lambda user: str.casefold(user[0])):
+                yield [Bold(user_name)] + crosstab.get(user_name, empty_row)
+            yield [Bold('Overall')] + crosstab[None]
+
+        return Table(['username'] + list(allowed_values), yield_rows)
+
+
+def import_challenges_into_archive(archive, challenge_names):
+    for challenge_name in challenge_names:
+        header, challenge_list = open_csv_stream(f"{challenge_name}.csv", ';')
+        recommendations = None
+        if os.path.exists(f"{challenge_name}_recommendations.csv"):
+            _, recommendations = open_csv(f"{challenge_name}_recommendations.csv", ';')
+        row_count = archive.import_challenge(challenge_name, header, challenge_list, recommendations)
+        print(f"Imported {row_count} entries of challenge {challenge_name}")
+
+
+def get_archive_report_sections(archive):
+    return [
+        ('Participants across all challenges', archive.get_leaderboard_table(), False),
+        ('Decade breakdown', archive.get_decade_breakdown_table(), False),
+        ('Country breakdown', archive.get_misc_field_breakdown_table('Country'), True),
+        ('Movies that have been challenged most', archive.get_most_frequent_entries_table(2), True)
+    ]
+
+
+REPORT_TABLES = {
+    'leaderboard': lambda ct, table: ct.get_leaderboard_table(table.get('options')),
+    'recommendations': lambda ct, table: ct.get_recommendations_table(),
+    'decade': lambda ct, table: ct.get_decade_breakdown_table(),
+    'misc_field': lambda ct, table: ct.get_misc_field_breakdown_table(table['field'], table.get('min_value', 1)),
+    'misc_field_by_user': lambda ct, table: ct.get_misc_field_breakdown_table_by_user(table['field'],
+                                                                                      table['allowed_values']),
+    'most_frequent': lambda ct, table: ct.get_most_frequent_entries_table(table.get('minimum_frequency', 2))
+}
+REPORT_EXTENSIONS = {'bbcode': 'txt', 'markdown': 'md', 'html': 'html', 'csv': 'csv'}
+BATCH_NETWORK_LIMITS = dict()
+
+
+def get_report_sections(ct, tables):
+    return [(table.get('title'), REPORT_TABLES[table['type']](ct, table), table.get('spoiler', False))
+            for table in tables]
+
+
+def init_batch_worker(rate_limit, next_slot, request_slots):
+    BATCH_NETWORK_LIMITS['rate_limiter'] = RateLimiter(rate_limit, next_slot)
+    BATCH_NETWORK_LIMITS['request_slots'] = request_slots
+
+
+def build_challenge_report(config_name, concurrency=8, cache_file='omdb_cache.sqlite', api_url=None):
+    start = time.perf_counter()
+    config = open_yaml(config_name)
+    challenge_name = config.get('challenge', os.path.basename(config_name))
+    filename = config.get('file', f"{challenge_name}.csv")
+    state = ChallengeState(f"{challenge_name}_state.json") if config.get('incremental', False) else None
+    cache_stats = None
+    if config.get('enrich', True):
+        cache = OMDBCache(cache_file)
+        with PROFILER.stage('enrich'):
+            ot = OMDBInfoTool(filename, concurrency=concurrency, cache=cache, api_url=api_url, **BATCH_NETWORK_LIMITS)
+            ot.add_info_to_csv()
+        cache_stats = cache.get_stats()
+
+    header, challenge_list = open_csv_stream(filename, ';')
+    recommendations = None
+    if config.get('recommendations'):
+        with PROFILER.stage('load recommendations'):
+            _, recommendations = open_csv(f"{challenge_name}_recommendations.csv", ';')
+    ct = IcmChallengeTool(header, challenge_list, challenge_name, recommendations=recommendations,
+                          breakdown_fields=config.get('breakdown_fields', BREAKDOWN_FIELDS), state=state)
+    sections = get_report_sections(ct, config['tables'])
+    outputs = config.get('outputs', {'bbcode': f"{challenge_name}_report.{REPORT_EXTENSIONS['bbcode']}"})
+    for output_format, output in outputs.items():
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            RENDERERS[output_format](file).write_report(sections)
+    return challenge_name, list(outputs.values()), time.perf_counter() - start, cache_stats
+
+
+def run_batch(config_names, workers=None, concurrency=8, rate_limit=10, cache_file='omdb_cache.sqlite',
+              api_url=None):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    # one rate limit and one pool of request slots for all workers, whatever the number of processes
+    next_slot = multiprocessing.Value('d', 0.0)
+    request_slots = multiprocessing.BoundedSemaphore(max(1, concurrency))
+    failed = list()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                             initargs=(rate_limit, next_slot, request_slots)) as executor:
+        futures = {executor.submit(build_challenge_report, config_name, concurrency, cache_file, api_url): config_name
+                   for config_name in config_names}
+        for future in as_completed(futures):
+            try:
+                challenge_name, outputs, seconds, cache_stats = future.result()
+            except Exception as e:
+                print(f"Failed to build report for {futures[future]}: {e!r}")
+                failed.append(futures[future])
+                continue
+            print(f"Built report for challenge {challenge_name} in {seconds:.1f}s"
+                  f"{f' ({cache_stats})' if cache_stats else ''}: {', '.join(outputs)}")
+    return failed
+
+
+REPORT_TABLE_SOURCES = {'leaderboard': {'entries', 'icm_lists'}, 'recommendations': {'entries', 'recommendations'}}
+
+
+def get_report_table_sources(table):
+    sources = REPORT_TABLE_SOURCES.get(table['type'], {'entries'})
+    if table['type'] == 'leaderboard' and 'recommendations' in (table.get('options') or []):
+        return sources | {'recommendations'}
+    return sources
 
-    def __get_imdb_cell(self, imdb_id):
-        return f"[td]\t[url=https://www.imdb.com/title/{imdb_id}/] :imdb: [/url]\t[/td]"
 
-    def __get_icm_cell(self, imdb_id):
-        return f"[td]\t[url=https://www.icheckmovies.com/search/movies/?query={imdb_id}/] :ICM: [/url]\t[/td]"
+def get_file_signature(filename):
+    try:
+        source_stat = os.stat(filename)
+    except OSError:
+        return None
+    return source_stat.st_mtime_ns, source_stat.st_size
+
+
+class ChallengeWatcher:
+    # keeps one challenge in memory and re-renders only the report tables whose source files changed
+    def __init__(self, config_name, interval=0.5, debounce=0.5, concurrency=8, rate_limit=10,
+                 cache_file='omdb_cache.sqlite', api_url=None):
+        self.config = open_yaml(config_name)
+        self.challenge_name = self.config.get('challenge', os.path.basename(config_name))
+        self.filename = self.config.get('file', f"{self.challenge_name}.csv")
+        self.recommendations_file = f"{self.challenge_name}_recommendations.csv" \
+            if self.config.get('recommendations') else None
+        self.tables = self.config['tables']
+        self.table_sources = [get_report_table_sources(table) for table in self.tables]
+        self.outputs = self.config.get('outputs',
+                                       {'bbcode': f"{self.challenge_name}_report.{REPORT_EXTENSIONS['bbcode']}"})
+        self.interval = interval
+        self.debounce = debounce
+        # enriching rewrites the challenge CSV, which could drop rows added meanwhile, so it has to be asked for
+        self.omdb_tool_options = {'concurrency': concurrency, 'rate_limit': rate_limit, 'api_url': api_url,
+                                  'cache': OMDBCache(cache_file)} if self.config.get('enrich', False) else None
+        self.ct = None
+        self.sections = None
+        self.header = None
+        self.row_count = 0
+        self.digest = None
+        self.signatures = dict()
+        self.rendered = {output_format: [''] * len(self.tables) for output_format in self.outputs}
+
+    def get_signatures(self):
+        return {
+            'entries': get_file_signature(self.filename),
+            'recommendations': get_file_signature(self.recommendations_file) if self.recommendations_file else None,
+            'icm_lists': [(list_name, get_file_signature(icm_list))
+                          for list_name, icm_list in yield_lists(self.challenge_name)]
+        }
+
+    def watch(self):
+        self.__try_update(set(self.get_signatures()))
+        pending = None
+        while True:
+            time.sleep(self.interval)
+            signatures = self.get_signatures()
+            if signatures == self.signatures:
+                pending = None
+                continue
+            # files are only read once they stopped changing for the debounce time
+            if pending is None or pending[0] != signatures:
+                pending = (signatures, time.monotonic())
+                continue
+            if time.monotonic() - pending[1] < self.debounce:
+                continue
+            self.__try_update({source for source, signature in signatures.items()
+                               if signature != self.signatures.get(source)})
+            pending = None
+
+    def __try_update(self, changed):
+        # a file caught mid-write or a failing OMDb lookup must not stop the watcher, the next poll tries again
+        try:
+            self.update(changed)
+        except Exception as e:
+            print(f"Could not update challenge {self.challenge_name}: {e!r}")
+
+    def update(self, changed):
+        old_signatures, self.signatures = self.signatures, self.get_signatures()
+        try:
+            self.__update_challenge(changed, old_signatures)
+        except Exception:
+            # the challenge may be half updated, e.g. by an append that failed midway, so it is rebuilt from
+            # scratch once the old signatures make the next poll see the files as changed again
+            self.signatures = old_signatures
+            self.ct = None
+            raise
+
+    def __update_challenge(self, changed, old_signatures):
+        start = time.perf_counter()
+        if self.ct is None:
+            self.__enrich()
+            self.__load_challenge()
+            changed = {'entries', 'recommendations', 'icm_lists'}
+        else:
+            if 'icm_lists' in changed:
+                self.__update_icm_lists(dict(old_signatures['icm_lists']))
+            if 'recommendations' in changed:
+                self.ct.set_recommendations(self.__load_recommendations())
+            if 'entries' in changed:
+                self.__update_entries()
+        updated = [i for i, sources in enumerate(self.table_sources) if sources & changed]
+        self.__render(updated)
+        print(f"Updated {len(updated)}/{len(self.tables)} tables of challenge {self.challenge_name} "
+              f"({', '.join(sorted(changed))}) in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def __load_recommendations(self):
+        if not self.recommendations_file or not os.path.exists(self.recommendations_file):
+            return None
+        _, recommendations = open_csv(self.recommendations_file, ';')
+        return recommendations
+
+    def __enrich(self):
+        if self.omdb_tool_options is not None:
+            OMDBInfoTool(self.filename, **self.omdb_tool_options).add_info_to_csv()
+            self.signatures['entries'] = get_file_signature(self.filename)
+
+    def __load_challenge(self, icm_lists=None):
+        header, challenge_list = open_csv_stream(self.filename, ';')
+        # the rows are digested as they are read from the file, the store pads or truncates them to the header
+        rows_digest = hashlib.sha1()
+        with closing(challenge_list):
+            next(iter_rows_into_digest(rows_digest, [header]))
+            recommendations = self.ct.recommendations if self.ct else self.__load_recommendations()
+            self.ct = IcmChallengeTool(header, iter_rows_into_digest(rows_digest, challenge_list),
+                                       self.challenge_name, recommendations=recommendations,
+                                       breakdown_fields=self.config.get('breakdown_fields', BREAKDOWN_FIELDS),
+                                       icm_lists=icm_lists)
+        self.sections = get_report_sections(self.ct, self.tables)
+        self.__set_entries(rows_digest)
+
+    def __set_entries(self, rows_digest):
+        self.header = self.ct.header
+        self.row_count = len(self.ct.store)
+        self.digest = rows_digest.hexdigest()
+
+    def __update_entries(self):
+        self.__enrich()
+        header, challenge_list = open_csv_stream(self.filename, ';')
+        rows_digest = hashlib.sha1()
+        with closing(challenge_list):
+            leading_rows = iter_rows_into_digest(rows_digest,
+                                                 islice(chain([header], challenge_list), self.row_count + 1))
+            if header != self.header or sum(1 for _ in leading_rows) <= self.row_count or \
+                    rows_digest.hexdigest() != self.digest:
+                # rows were edited or removed rather than appended
+                self.__load_challenge(self.ct.icm_lists)
+                return
+            # only the appended rows are left in challenge_list, they continue the digest of the leading rows
+            self.ct.add_entries(iter_rows_into_digest(rows_digest, challenge_list))
+        self.__set_entries(rows_digest)
+
+    def __update_icm_lists(self, old_signatures):
+        icm_lists = dict()
+        for list_name, icm_list in yield_lists(self.challenge_name):
+            if list_name in self.ct.icm_lists and old_signatures.get(list_name) == get_file_signature(icm_list):
+                icm_lists[list_name] = self.ct.icm_lists[list_name]
+            else:
+                icm_lists[list_name] = load_icm_list(icm_list)
+        self.ct.set_icm_lists(icm_lists)
+        # the leaderboard header lists the ICM lists
+        self.sections = get_report_sections(self.ct, self.tables)
+
+    def __render(self, updated):
+        for output_format, output in self.outputs.items():
+            rendered = self.rendered[output_format]
+            for i in updated:
+                buffer = io.StringIO()
+                RENDERERS[output_format](buffer).write_report([self.sections[i]])
+                rendered[i] = buffer.getvalue()
+            tmp_file = f"{output}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8', newline='') as file:
+                file.write(''.join(rendered))
+            os.replace(tmp_file, output)
+
+
+def write_profile(profile=False, trace_file=None, cprofile_file=None):
+    if profile:
+        PROFILER.write_summary(sys.stderr)
+    if trace_file:
+        PROFILER.write_trace(trace_file)
+    if cprofile_file:
+        PROFILER.dump_cprofile(cprofile_file)
+
+
+DEFAULT_REPORT_TABLES = [
+    {'type': 'leaderboard', 'options': ['recommendations']},
+    {'type': 'recommendations', 'title': 'Bonus game recommendations'},
+    {'type': 'misc_field', 'field': 'Country', 'title': 'Country breakdown'},
+    {'type': 'decade', 'title': 'Decade breakdown'},
+    {'type': 'misc_field', 'field': 'Director', 'min_value': 2, 'title': 'Director breakdown (n >= 2)',
+     'spoiler': True},
+    {'type': 'misc_field', 'field': 'Genre', 'title': 'Genre breakdown', 'spoiler': True},
+    {'type': 'most_frequent', 'minimum_frequency': 2, 'title': 'Movies that have been challenged more than once',
+     'spoiler': True}
+]
+
+
+def get_tables_without_recommendations(tables):
+    return [dict(table, options=[option for option in table.get('options') or [] if option != 'recommendations'])
+            for table in tables if table['type'] != 'recommendations']
+
+
+def enrich_challenge(args):
+    print(f"Adding OMDb info for challenge {args.challenge}...")
+    omdb_cache = OMDBCache(args.cache)
+    with PROFILER.stage('enrich'):
+        ot = OMDBInfoTool(args.file or f"{args.challenge}.csv", concurrency=args.concurrency,
+                          rate_limit=args.rate_limit, cache=omdb_cache, api_url=args.omdb_url)
+        ot.add_info_to_csv()
+    print(omdb_cache.get_stats())
+
+
+def report_challenge(args):
+    if args.enrich:
+        enrich_challenge(args)
+    config = open_yaml(args.config) if args.config else dict()
+    tables = config.get('tables', DEFAULT_REPORT_TABLES)
+    recommendations_file = f"{args.challenge}_recommendations.csv"
+    # the challenge rows are read lazily while the tool builds its store, in the 'load csv' stage
+    header, challenge_list = open_csv_stream(args.file or f"{args.challenge}.csv", ';')
+    recommendations = None
+    if os.path.exists(recommendations_file):
+        with PROFILER.stage('load recommendations'):
+            _, recommendations = open_csv(recommendations_file, ';')
+    if recommendations is None:
+        tables = get_tables_without_recommendations(tables)
+    challenge_state = ChallengeState(f"{args.challenge}_state.json") if args.incremental else None
+    ct = IcmChallengeTool(header, challenge_list, args.challenge, recommendations=recommendations,
+                          breakdown_fields=config.get('breakdown_fields', BREAKDOWN_FIELDS), state=challenge_state)
+    sections = get_report_sections(ct, tables)
+    clipboard_buffer = io.StringIO() if args.clipboard else None
+    with open(args.output, 'w', encoding='utf-8', newline='') if args.output else nullcontext(sys.stdout) as output:
+        sink = MultiSink(output, clipboard_buffer) if clipboard_buffer else output
+        RENDERERS[args.format](sink).write_report(sections)
+    if clipboard_buffer:
+        write_to_clipboard(clipboard_buffer.getvalue())
+
+
+def run_batch_command(args):
+    # the reports are built in worker processes, so only the time of the whole batch is profiled here
+    with PROFILER.stage('batch'):
+        failed = run_batch(args.configs, args.workers, args.concurrency, args.rate_limit, args.cache, args.omdb_url)
+    return 1 if failed else 0
+
+
+def watch_challenge(args):
+    try:
+        ChallengeWatcher(args.config, args.interval, args.debounce, args.concurrency, args.rate_limit, args.cache,
+                         args.omdb_url).watch()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_archive_command(args):
+    challenge_archive = ChallengeArchive(args.database)
+    import_challenges_into_archive(challenge_archive, args.import_challenges or [])
+    if args.report:
+        BBCodeRenderer(sys.stdout).write_report(get_archive_report_sections(challenge_archive))
+
+
+def parse_args(argv=None):
+    omdb_parser = argparse.ArgumentParser(add_help=False)
+    omdb_parser.add_argument('--concurrency', type=int, default=8, help='maximum parallel OMDb requests')
+    omdb_parser.add_argument('--rate-limit', type=float, default=10, help='maximum OMDb requests per second')
+    omdb_parser.add_argument('--omdb-url', help='OMDb API url, e.g. of a local omdb_stand_in.py server')
+    omdb_parser.add_argument('--cache', default='omdb_cache.sqlite', help='SQLite file of the OMDb cache')
+
+    challenge_parser = argparse.ArgumentParser(add_help=False)
+    challenge_parser.add_argument('challenge', help='challenge name, e.g. dtc for dtc.csv and icm_lists/dtc/')
+    challenge_parser.add_argument('--file', help='challenge CSV (default: <challenge>.csv)')
+
+    profile_parser = argparse.ArgumentParser(add_help=False)
+    profile_parser.add_argument('--profile', action='store_true',
+                                help='print wall time, calls and peak memory of every pipeline stage to stderr')
+    profile_parser.add_argument('--profile-trace', metavar='FILE', help='write the stage timings as JSON to this file')
+    profile_parser.add_argument('--profile-stage', metavar='STAGE',
+                                help='run cProfile during this stage, e.g. aggregate or "render Country breakdown"')
+    profile_parser.add_argument('--profile-output', metavar='FILE', help='cProfile dump file for --profile-stage')
+
+    parser = argparse.ArgumentParser(description='Build iCheckMovies challenge reports.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enrich_parser = commands.add_parser('enrich', parents=[challenge_parser, omdb_parser, profile_parser],
+                                        help='add OMDb info to the entries of a challenge CSV')
+    enrich_parser.set_defaults(run=enrich_challenge)
+
+    report_parser = commands.add_parser('report', parents=[challenge_parser, omdb_parser, profile_parser],
+                                        help='build the report of a challenge')
+    report_parser.add_argument('--config', help='challenge config with the report tables (YAML file without .yaml)')
+    report_parser.add_argument('--format', choices=list(RENDERERS), default='bbcode')
+    report_parser.add_argument('--output', help='write the report to this file instead of stdout')
+    report_parser.add_argument('--clipboard', action='store_true', help='also copy the report to the clipboard')
+    report_parser.add_argument('--enrich', action='store_true', help='add OMDb info to the challenge CSV first')
+    report_parser.add_argument('--incremental', action='store_true',
+                               help='reuse and update the aggregates saved in <challenge>_state.json')
+    report_parser.set_defaults(run=report_challenge)
+
+    batch_parser = commands.add_parser('batch', parents=[omdb_parser, profile_parser],
+                                       help='build the reports of several challenge configs in worker processes')
+    batch_parser.add_argument('configs', nargs='+', metavar='CONFIG',
+                              help='challenge configs (YAML files without .yaml)')
+    batch_parser.add_argument('--workers', type=int, help='number of worker processes')
+    batch_parser.set_defaults(run=run_batch_command)
+
+    watch_parser = commands.add_parser('watch', parents=[omdb_parser, profile_parser],
+                                       help='keep the report of a challenge config up to date while its files change')
+    watch_parser.add_argument('config', help='challenge config (YAML file without .yaml)')
+    watch_parser.add_argument('--interval', type=float, default=0.5, help='seconds between checks')
+    watch_parser.add_argument('--debounce', type=float, default=0.5,
+                              help='seconds a changed file has to stay unchanged before it is read')
+    watch_parser.set_defaults(run=watch_challenge)
+
+    archive_parser = commands.add_parser('archive', parents=[profile_parser],
+                                         help='import challenges into the archive or report across them')
+    archive_parser.add_argument('--database', default='challenges.sqlite', help='SQLite file of the archive')
+    archive_parser.add_argument('--import', dest='import_challenges', nargs='+', metavar='CHALLENGE',
+                                help='import or replace the given challenges')
+    archive_parser.add_argument('--report', action='store_true', help='print a report across all archived challenges')
+    archive_parser.set_defaults(run=run_archive_command)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile or args.profile_trace or args.profile_stage:
+        PROFILER.enable(args.profile_stage)
+    exit_code = args.run(args)
+    write_profile(args.profile, args.profile_trace,
+                  args.profile_stage and (args.profile_output or f"{args.profile_stage.replace(' ', '_')}.prof"))
+    return exit_code
 
 
 if __name__ == '__main__':
-    # challenge_name = 'southeastasia'
-    # country_list = ['Brunei', 'Cambodia', 'Indonesia', 'Laos', 'Malaysia',
-    #                 'Myanmar', 'Philippines', 'Singapore', 'Thailand', 'Timor-Leste', 'Vietnam']
-    # ot = OMDBInfoTool(f"{challenge_name}.csv")
-    # ot.add_info_to_csv()
-    # header, challenge_list = open_csv(f"{challenge_name}.csv", ';')
-    # ct = IcmChallengeTool(header, challenge_list, challenge_name)
-    # table = f"{ct.print_leaderboard()}\n"
-    # table += f"\nCountry breakdown:\n{ct.print_misc_field_breakdown_table_by_user('Country', country_list)}\n"
-    # table += f"\nDecade breakdown:{ct.print_decade_breakdown()}\n"
-    # table += f"\n[spoiler=Director breakdown]{ct.print_misc_field_breakdown_table('Director', 2)}[/spoiler]\n"
-    # table += f"\n[spoiler=Genre breakdown]{ct.print_misc_field_breakdown_table('Genre')}[/spoiler]\n"
-    # table += f"\n\n[spoiler=Movies that have been challenged more than once]"
-    # table += f"{ct.print_table_of_most_frequent_entries(2)}\n[/spoiler]"
-    # print(table)
-    # write_to_clipboard_mac(table)
-
-    # challenge_name = '1000400'
-    # # ot = OMDBInfoTool(f"{challenge_name}.csv")
-    # # ot.add_info_to_csv()
-    # header, challenge_list = open_csv(f"{challenge_name}.csv", ';')
-    # ct = IcmChallengeTool(header, challenge_list, challenge_name)
-    # table = f"{ct.print_leaderboard()}\n"
-    # table += f"\n[spoiler=Country breakdown (incl. co-production countries)]" \
-    #          f"{ct.print_misc_field_breakdown_table('Country')}[/spoiler]\n"
-    # table += f"\n[spoiler=Language breakdown]{ct.print_misc_field_breakdown_table('Language')}[/spoiler]\n"
-    # table += f"\n[spoiler=Genre breakdown]{ct.print_misc_field_breakdown_table('Genre')}[/spoiler]\n"
-    # print(table)
-    # write_to_clipboard_mac(table)
-
-    # challenge_name = 'waves'
-    # ot = OMDBInfoTool(f"{challenge_name}.csv")
-    # ot.add_info_to_csv()
-    # header, challenge_list = open_csv(f"{challenge_name}.csv", ';')
-    # ct = IcmChallengeTool(header, challenge_list, challenge_name)
-    # table = f"{ct.print_leaderboard()}\n"
-    # table += f"\nCountry breakdown:\n{ct.print_misc_field_breakdown_table('Country')}\n"
-    # table += f"\nDecade breakdown:{ct.print_decade_breakdown()}\n"
-    # table += f"\n[spoiler=Director breakdown]{ct.print_misc_field_breakdown_table('Director', 2)}[/spoiler]\n"
-    # table += f"\n[spoiler=Genre breakdown]{ct.print_misc_field_breakdown_table('Genre')}[/spoiler]\n"
-    # table += f"\n\n[spoiler=Movies that have been challenged more than once]"
-    # table += f"{ct.print_table_of_most_frequent_entries(2)}\n[/spoiler]"
-    # print(table)
-    # write_to_clipboard(table)
-
-    challenge_name = 'dtc'
-    print(f"Adding OMDb info for challenge {challenge_name}...")
-    ot = OMDBInfoTool(f"{challenge_name}.csv")
-    ot.add_info_to_csv()
-    print(f"Creating tables for challenge {challenge_name}...")
-    header, challenge_list = open_csv(f"{challenge_name}.csv", ';')
-    _, recommendations = open_csv(f"{challenge_name}_recommendations.csv", ';')
-    ct = IcmChallengeTool(header, challenge_list, challenge_name, recommendations=recommendations)
-    table = f"\n{ct.print_leaderboard(options=['recommendations'])}\n"
-    table += f"\nBonus game recommendations:\n{ct.get_recommendations_list()}\n"
-    table += f"\nCountry breakdown:\n{ct.print_misc_field_breakdown_table('Country')}\n"
-    table += f"\nDecade breakdown:{ct.print_decade_breakdown()}\n"
-    table += f"\n[spoiler=Director breakdown (n >= 2)]{ct.print_misc_field_breakdown_table('Director', 2)}[/spoiler]\n"
-    table += f"\n[spoiler=Genre breakdown]{ct.print_misc_field_breakdown_table('Genre')}[/spoiler]\n"
-    table += f"\n\n[spoiler=Movies that have been challenged more than once]"
-    table += f"{ct.print_table_of_most_frequent_entries(2)}\n[/spoiler]"
-    print(table)
-    write_to_clipboard(table)
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NOT_FOUND = {'Response': 'False', 'Error': 'Incorrect IMDb ID.'}
+
+
+class OMDbStandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, latency=0.0, error_rate=0.0, throttle_rate=0.0, malformed_rate=0.0,
+                 seed=None):
+        super().__init__(address, OMDbStandInHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'found': 0, 'not_found': 0, 'errors': 0, 'throttled': 0, 'malformed': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def draw(self):
+        with self.lock:
+            return self.random.random()
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/"
+
+
+class OMDbStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+        if server.latency:
+            time.sleep(server.latency)
+
+        draw = server.draw()
+        if draw < server.throttle_rate:
+            server.count('throttled')
+            return self.send_body(429, b'{"Response":"False","Error":"Too many requests."}', {'Retry-After': '1'})
+        draw -= server.throttle_rate
+        if draw < server.error_rate:
+            server.count('errors')
+            return self.send_body(503, b'Service Unavailable', {'Content-Type': 'text/plain'})
+        draw -= server.error_rate
+        if draw < server.malformed_rate:
+            server.count('malformed')
+            return self.send_body(200, b'{"Title": "trunc')
+
+        imdb_id = parse_qs(urlparse(self.path).query).get('i', [''])[0]
+        fixture = server.fixtures.get(imdb_id)
+        server.count('found' if fixture else 'not_found')
+        response = dict(fixture, imdbID=imdb_id, Response='True') if fixture else NOT_FOUND
+        self.send_body(200, json.dumps(response).encode('utf-8'))
+
+    do_POST = do_GET
+
+    def send_body(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in dict({'Content-Type': 'application/json'}, **(headers or {})).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def load_fixtures(filename):
+    # {imdb_id: OMDb record} as returned by http://www.omdbapi.com/?i=<imdb_id>
+    with open(filename, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def start_server(fixtures, host='127.0.0.1', port=0, **options):
+    server = OMDbStandInServer((host, port), fixtures, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve OMDb answers from a fixture file for offline enrichment.')
+    parser.add_argument('fixtures', help='JSON file mapping IMDb ids to OMDb records')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to wait before every answer')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='share of requests answered with 429')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='share of answers with broken JSON')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    server = OMDbStandInServer((args.host, args.port), load_fixtures(args.fixtures), latency=args.latency,
+                               error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                               malformed_rate=args.malformed_rate, seed=args.seed)
+    print(f"Serving {len(server.fixtures)} OMDb fixtures on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+
+
+if __name__ == '__main__':
+    main()